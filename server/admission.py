@@ -0,0 +1,218 @@
+"""
+Admission control: concurrency limits with bounded wait queues.
+
+Each limiter admits up to `max_concurrent` callers, lets up to `max_queue`
+more wait for at most `queue_timeout` seconds, and rejects everyone else
+immediately with OverloadedError so the caller can answer 503 + Retry-After
+instead of piling up behind a bottleneck.
+"""
+import os
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Tuple
+
+import metrics
+
+logger = logging.getLogger(__name__)
+
+ADMISSION_LIMIT = metrics.gauge(
+    'pokedex_admission_limit',
+    'Configured admission limits by limiter',
+    ['limiter', 'kind']
+)
+ADMISSION_IN_FLIGHT = metrics.gauge(
+    'pokedex_admission_in_flight',
+    'Callers currently admitted or queued by limiter',
+    ['limiter', 'state']
+)
+ADMISSION_REJECTED = metrics.counter(
+    'pokedex_admission_rejected_total',
+    'Callers rejected by a limiter',
+    ['limiter', 'reason']
+)
+ADMISSION_WAIT_SECONDS = metrics.histogram(
+    'pokedex_admission_queue_wait_seconds',
+    'Time admitted callers spent queued',
+    ['limiter']
+)
+
+
+class OverloadedError(Exception):
+    """Raised when a limiter's queue is full or the queue wait timed out."""
+
+    def __init__(self, limiter: str, retry_after: int):
+        super().__init__(f"Server is overloaded ({limiter}), retry in {retry_after}s")
+        self.limiter = limiter
+        self.retry_after = retry_after
+
+
+class ConcurrencyLimiter:
+    """Semaphore with a bounded, time-limited wait queue."""
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrent: int,
+        max_queue: int,
+        queue_timeout: float,
+        retry_after: int = 1
+    ):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self.active = 0
+        self.waiting = 0
+        self._condition = threading.Condition()
+
+        ADMISSION_LIMIT.set(max_concurrent, limiter=name, kind='max_concurrent')
+        ADMISSION_LIMIT.set(max_queue, limiter=name, kind='max_queue')
+        ADMISSION_LIMIT.set(queue_timeout, limiter=name, kind='queue_timeout_seconds')
+        ADMISSION_IN_FLIGHT.set_function(lambda: self.active, limiter=name, state='active')
+        ADMISSION_IN_FLIGHT.set_function(lambda: self.waiting, limiter=name, state='queued')
+
+    def _reject(self, reason: str) -> OverloadedError:
+        ADMISSION_REJECTED.inc(limiter=self.name, reason=reason)
+        logger.warning(f"Admission rejected by {self.name}: {reason}")
+        return OverloadedError(self.name, self.retry_after)
+
+    def acquire(self) -> None:
+        """
+        Take a slot, waiting in the bounded queue if necessary.
+
+        Raises:
+            OverloadedError: If the queue is full or the wait timed out
+        """
+        with self._condition:
+            if self.active < self.max_concurrent and self.waiting == 0:
+                self.active += 1
+                return
+            if self.waiting >= self.max_queue:
+                raise self._reject('queue_full')
+
+            self.waiting += 1
+            start = time.perf_counter()
+            try:
+                admitted = self._condition.wait_for(
+                    lambda: self.active < self.max_concurrent, timeout=self.queue_timeout
+                )
+            finally:
+                self.waiting -= 1
+            if not admitted:
+                raise self._reject('queue_timeout')
+            self.active += 1
+        ADMISSION_WAIT_SECONDS.observe(time.perf_counter() - start, limiter=self.name)
+
+    def try_acquire(self) -> bool:
+        """
+        Take a slot only if one is free right now, without queueing.
+
+        Returns:
+            True if a slot was taken, False if the limiter is busy
+        """
+        with self._condition:
+            if self.active < self.max_concurrent and self.waiting == 0:
+                self.active += 1
+                return True
+            return False
+
+    def release(self) -> None:
+        """Give a slot back and wake one queued caller."""
+        with self._condition:
+            self.active -= 1
+            self._condition.notify()
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        """Hold a slot for the duration of the block."""
+        self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+
+def _parse_route_limits(raw: str) -> Dict[str, Tuple[int, int]]:
+    """Parse ROUTE_LIMITS ('/api/pokemon=32:64,/api/pokemon/captured=8:16')."""
+    limits: Dict[str, Tuple[int, int]] = {}
+    for entry in filter(None, (part.strip() for part in raw.split(','))):
+        try:
+            route, values = entry.rsplit('=', 1)
+            max_concurrent, max_queue = values.split(':')
+            limits[route] = (int(max_concurrent), int(max_queue))
+        except ValueError:
+            logger.error(f"Ignoring invalid ROUTE_LIMITS entry: {entry}")
+    return limits
+
+
+_route_max_concurrent: int = int(os.getenv('ROUTE_MAX_CONCURRENT', 32))
+_route_max_queue: int = int(os.getenv('ROUTE_MAX_QUEUE', 64))
+_route_queue_timeout: float = float(os.getenv('ROUTE_QUEUE_TIMEOUT', 2))
+_route_overrides: Dict[str, Tuple[int, int]] = _parse_route_limits(os.getenv('ROUTE_LIMITS', ''))
+_route_limiters: Dict[str, ConcurrencyLimiter] = {}
+_route_limiters_lock = threading.Lock()
+
+# Routes that must answer even when the API is saturated
+EXEMPT_ROUTES = frozenset({'/metrics', '/api/health', '/api/health/live', '/api/health/ready'})
+
+# db.get() takes 2 seconds and cannot be sped up: run few at a time, queue briefly
+db_load_limiter = ConcurrencyLimiter(
+    'db_get',
+    max_concurrent=int(os.getenv('DB_GET_MAX_CONCURRENT', 2)),
+    max_queue=int(os.getenv('DB_GET_MAX_QUEUE', 8)),
+    queue_timeout=float(os.getenv('DB_GET_QUEUE_TIMEOUT', 5)),
+    retry_after=2
+)
+
+
+def get_route_limiter(route: Optional[str]) -> Optional[ConcurrencyLimiter]:
+    """
+    Get (creating on first use) the limiter for a route rule.
+
+    Args:
+        route: URL rule, e.g. '/api/pokemon'
+
+    Returns:
+        The route's limiter, or None for unmatched and exempt routes
+    """
+    if route is None or route in EXEMPT_ROUTES:
+        return None
+
+    limiter = _route_limiters.get(route)
+    if limiter is None:
+        with _route_limiters_lock:
+            limiter = _route_limiters.get(route)
+            if limiter is None:
+                max_concurrent, max_queue = _route_overrides.get(
+                    route, (_route_max_concurrent, _route_max_queue)
+                )
+                limiter = ConcurrencyLimiter(
+                    f"route:{route}", max_concurrent, max_queue, _route_queue_timeout
+                )
+                _route_limiters[route] = limiter
+    return limiter
+
+
+def create_pool_limiter(max_conn: int) -> ConcurrencyLimiter:
+    """
+    Build the limiter guarding the PostgreSQL pool.
+
+    ThreadedConnectionPool raises instead of waiting when exhausted, so
+    callers queue here (bounded) rather than failing with PoolError.
+
+    Args:
+        max_conn: Pool size
+
+    Returns:
+        Limiter admitting at most max_conn concurrent connection holders
+    """
+    return ConcurrencyLimiter(
+        'db_pool',
+        max_concurrent=max_conn,
+        max_queue=int(os.getenv('DB_POOL_MAX_QUEUE', 2 * max_conn)),
+        queue_timeout=float(os.getenv('DB_POOL_QUEUE_TIMEOUT', 2)),
+        retry_after=1
+    )
@@ -2,28 +2,37 @@
 Flask application for Pokédex API.
 """
 import os
+import json
 import logging
-from typing import Dict, Any
-from flask import Flask, jsonify, request
+import time
+from flask import Flask, Response, g, jsonify, request
 from flask_cors import CORS
 
-import db
+import dataset
 import db_schema
-from database import (
-    init_connection_pool,
-    get_db_connection,
-    return_db_connection,
-    close_connection_pool,
-    check_db_health
-)
+import metrics
+import profiling
+from admission import OverloadedError, get_route_limiter
+from captured import MAX_PAGE_SIZE, decode_cursor, list_captured, set_captured
+from database import init_connection_pool, close_connection_pool
+from db_schema import DEFAULT_TRAINER_ID
 from cache import (
     init_redis_connection,
     get_cached_pokemon,
+    get_cached_snapshot,
     get_cached_types,
     invalidate_cache,
-    check_redis_health,
-    is_redis_enabled
+    load_from_db
+)
+from health import (
+    get_health_state,
+    get_readiness,
+    is_prober_running,
+    run_health_checks,
+    start_health_prober,
+    stop_health_prober
 )
+from pokemon_index import get_index
 from utils import filter_by_type, fuzzy_search, sort_pokemon
 
 # Configure logging
@@ -33,10 +42,32 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# trainer_id is a PostgreSQL BIGINT
+MAX_TRAINER_ID = 2 ** 63 - 1
+
+# Maximum keys accepted by POST /api/pokemon/multi-get
+MAX_MULTI_GET_KEYS = 1000
+
 # Initialize Flask app
 app = Flask(__name__)
 CORS(app, supports_credentials=True)
 
+HTTP_REQUESTS = metrics.counter(
+    'pokedex_http_requests_total',
+    'HTTP requests by route, method and status',
+    ['route', 'method', 'status']
+)
+HTTP_REQUEST_SECONDS = metrics.histogram(
+    'pokedex_http_request_duration_seconds',
+    'HTTP request latency by route and method',
+    ['route', 'method']
+)
+REQUEST_STAGE_SECONDS = metrics.histogram(
+    'pokedex_request_stage_duration_seconds',
+    'Time spent in each stage of request handling',
+    ['route', 'stage']
+)
+
 
 class ValidationError(Exception):
     """Raised when request validation fails."""
@@ -62,6 +93,15 @@ def handle_not_found_error(e: NotFoundError):
     return jsonify({'error': str(e)}), 404
 
 
+@app.errorhandler(OverloadedError)
+def handle_overloaded_error(e: OverloadedError):
+    """Shed load with a fast 503 and a Retry-After hint."""
+    response = jsonify({'error': str(e)})
+    response.status_code = 503
+    response.headers['Retry-After'] = str(e.retry_after)
+    return response
+
+
 @app.errorhandler(Exception)
 def handle_generic_error(e: Exception):
     """Handle generic errors."""
@@ -69,59 +109,142 @@ def handle_generic_error(e: Exception):
     return jsonify({'error': 'An internal server error occurred'}), 500
 
 
+@app.before_request
+def start_request_timer():
+    """Record the request start time for latency metrics."""
+    g.request_start = time.perf_counter()
+
+
+@app.before_request
+def admit_request():
+    """Apply the per-route concurrency limit (raises OverloadedError when full)."""
+    limiter = get_route_limiter(request.url_rule.rule if request.url_rule else None)
+    if limiter is not None:
+        limiter.acquire()
+        g.route_limiter = limiter
+
+
+@app.teardown_request
+def release_request_slot(error):
+    """Release the per-route concurrency slot."""
+    limiter = g.pop('route_limiter', None)
+    if limiter is not None:
+        limiter.release()
+
+
+@app.after_request
+def record_request_metrics(response):
+    """Record per-route latency and status metrics."""
+    start = g.pop('request_start', None)
+    if start is not None:
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        HTTP_REQUEST_SECONDS.observe(
+            time.perf_counter() - start, route=route, method=request.method
+        )
+        # after_request hooks run in reverse, so a profile may already have replaced the response
+        status = g.pop('profiled_status', response.status_code)
+        HTTP_REQUESTS.inc(route=route, method=request.method, status=str(status))
+    return response
+
+
+@app.before_request
+def start_request_profiler():
+    """Start the opt-in profiler for authorized or sampled requests."""
+    if request.endpoint in ('metrics_endpoint', 'get_aggregated_profile'):
+        return
+    g.profiler, g.profile_trigger = profiling.start_request_profiler(request.headers)
+
+
+@app.after_request
+def finish_request_profiler(response):
+    """Stop the request profiler and return the profile to authorized callers."""
+    profiler = g.pop('profiler', None)
+    if profiler is None:
+        return response
+    
+    profiler.stop()
+    if g.pop('profile_trigger', None) == 'sampled':
+        profiling.record_sampled_profile(profiler)
+        return response
+    
+    if profiler.mode == 'cprofile':
+        profiled = Response(profiler.dump(), mimetype='application/octet-stream')
+    else:
+        profiled = Response(profiler.collapsed(), mimetype='text/plain')
+        profiled.headers['X-Profile-Samples'] = str(profiler.sample_count())
+    profiled.headers['Content-Disposition'] = (
+        f'attachment; filename={profiling.profile_filename(profiler)}'
+    )
+    profiled.headers['X-Profiled-Status'] = str(response.status_code)
+    g.profiled_status = response.status_code
+    return profiled
+
+
+@app.teardown_request
+def stop_request_profiler(error):
+    """Make sure a profiler never outlives its request."""
+    profiler = g.pop('profiler', None)
+    if profiler is not None:
+        profiler.stop()
+
+
+@app.route('/debug/profile', methods=['GET'])
+def get_aggregated_profile():
+    """Get collapsed stacks aggregated from sampled requests (requires X-Profile token)."""
+    if not profiling.is_authorized(request.headers):
+        raise NotFoundError("Not found")
+    
+    reset = request.args.get('reset', 'false').lower() == 'true'
+    profile = profiling.get_aggregated_profile(reset=reset)
+    response = Response(profile['collapsed'], mimetype='text/plain')
+    response.headers['X-Profiled-Requests'] = str(profile['requests'])
+    return response
+
+
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    """Expose collected metrics in Prometheus text format."""
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """
-    Health check endpoint for Redis, PostgreSQL, and DB file.
+    Health check endpoint for Redis, PostgreSQL, DB file and dataset cache.
+    
+    Serves the background prober's cached result when it is running, and
+    falls back to checking synchronously otherwise.
     
     Returns:
         JSON with health status of all services
     """
-    health_status: Dict[str, Any] = {
-        'status': 'healthy',
-        'services': {}
-    }
-    
-    # Check Redis
-    redis_healthy = check_redis_health()
-    health_status['services']['redis'] = {
-        'status': 'healthy' if redis_healthy else 'unhealthy',
-        'enabled': is_redis_enabled()
-    }
-    
-    # Check PostgreSQL
-    db_healthy = check_db_health()
-    health_status['services']['postgresql'] = {
-        'status': 'healthy' if db_healthy else 'unhealthy'
-    }
-    
-    # Check DB file access
-    try:
-        import db
-        # Just check if we can access the file (don't actually read it)
-        db_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "pokemon_db.json"))
-        file_accessible = os.path.exists(db_path) and os.access(db_path, os.R_OK)
-        health_status['services']['db_file'] = {
-            'status': 'healthy' if file_accessible else 'unhealthy'
-        }
-    except Exception as e:
-        logger.error(f"DB file health check failed: {e}")
-        health_status['services']['db_file'] = {
-            'status': 'unhealthy',
-            'error': str(e)
-        }
-    
-    # Overall status
-    all_healthy = (
-        health_status['services']['postgresql']['status'] == 'healthy' and
-        health_status['services']['db_file']['status'] == 'healthy'
-    )
-    health_status['status'] = 'healthy' if all_healthy else 'degraded'
+    health_status = get_health_state() if is_prober_running() else None
+    if health_status is None:
+        health_status = run_health_checks()
     
-    status_code = 200 if all_healthy else 503
+    status_code = 200 if health_status['status'] == 'healthy' else 503
     return jsonify(health_status), status_code
 
 
+@app.route('/api/health/live', methods=['GET'])
+def liveness_check():
+    """Liveness probe - the process is up and serving requests."""
+    return jsonify({'status': 'alive'})
+
+
+@app.route('/api/health/ready', methods=['GET'])
+def readiness_check():
+    """Readiness probe - served from the background prober's cached result."""
+    readiness = get_readiness()
+    body = {
+        'status': 'ready' if readiness['ready'] else 'not_ready',
+        'health': readiness['health']
+    }
+    if readiness['reason']:
+        body['reason'] = readiness['reason']
+    return jsonify(body), 200 if readiness['ready'] else 503
+
+
 @app.route('/icon/<name>')
 def get_icon_url(name: str):
     """Get Pokemon icon URL."""
@@ -152,20 +275,26 @@ def get_pokemon():
         if page_size not in valid_page_sizes:
             page_size = 10
         
+        route = '/api/pokemon'
+        
         # Get cached Pokemon data
-        all_pokemon = get_cached_pokemon()
+        with REQUEST_STAGE_SECONDS.time(route=route, stage='cache_fetch'):
+            all_pokemon = get_cached_pokemon()
         
         # Apply filters
         filtered_pokemon = all_pokemon
         
         if type_filter:
-            filtered_pokemon = filter_by_type(filtered_pokemon, type_filter)
+            with REQUEST_STAGE_SECONDS.time(route=route, stage='filter'):
+                filtered_pokemon = filter_by_type(filtered_pokemon, type_filter)
         
         if search_query:
-            filtered_pokemon = fuzzy_search(filtered_pokemon, search_query)
+            with REQUEST_STAGE_SECONDS.time(route=route, stage='search'):
+                filtered_pokemon = fuzzy_search(filtered_pokemon, search_query)
         
         # Apply sorting
-        sorted_pokemon = sort_pokemon(filtered_pokemon, sort)
+        with REQUEST_STAGE_SECONDS.time(route=route, stage='sort'):
+            sorted_pokemon = sort_pokemon(filtered_pokemon, sort)
         
         # Calculate pagination
         total = len(sorted_pokemon)
@@ -182,54 +311,85 @@ def get_pokemon():
         end_idx = start_idx + page_size
         paginated_pokemon = sorted_pokemon[start_idx:end_idx]
         
-        return jsonify({
-            'pokemon': paginated_pokemon,
-            'total': total,
-            'page': page,
-            'page_size': page_size,
-            'total_pages': total_pages
-        })
+        with REQUEST_STAGE_SECONDS.time(route=route, stage='serialize'):
+            return jsonify({
+                'pokemon': paginated_pokemon,
+                'total': total,
+                'page': page,
+                'page_size': page_size,
+                'total_pages': total_pages
+            })
     
-    except ValidationError:
+    except (ValidationError, OverloadedError):
         raise
     except Exception as e:
         logger.error(f"Error in get_pokemon: {e}", exc_info=True)
         raise
 
 
+def get_trainer_id() -> int:
+    """
+    Get the trainer for the current request from the X-Trainer-Id header.
+    
+    The header is unauthenticated and stands in for real authentication:
+    any caller can name any trainer. The client does not send it yet, so all
+    of its users share the DEFAULT_TRAINER_ID collection.
+    
+    Returns:
+        Trainer id (DEFAULT_TRAINER_ID when none is given)
+    """
+    raw = request.headers.get('X-Trainer-Id')
+    if raw is None:
+        return DEFAULT_TRAINER_ID
+    try:
+        trainer_id = int(raw)
+    except ValueError:
+        raise ValidationError("Invalid trainer id") from None
+    if not 0 <= trainer_id <= MAX_TRAINER_ID:
+        raise ValidationError("Invalid trainer id")
+    return trainer_id
+
+
 @app.route('/api/pokemon/captured', methods=['GET'])
 def get_captured_pokemon():
-    """Get list of captured Pokemon names."""
-    conn = None
+    """Get one keyset page of the trainer's captured Pokemon."""
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
+        trainer_id = get_trainer_id()
         
-        cursor.execute("SELECT pokemon_name FROM captured_pokemon")
-        results = cursor.fetchall()
+        try:
+            limit = int(request.args.get('limit', MAX_PAGE_SIZE))
+        except ValueError:
+            raise ValidationError("Invalid limit parameter") from None
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
         
-        captured_names = [row[0] for row in results]
+        cursor = request.args.get('cursor')
+        try:
+            after = decode_cursor(cursor) if cursor else None
+        except ValueError as e:
+            raise ValidationError(str(e)) from e
         
-        cursor.close()
-        return_db_connection(conn)
+        page = list_captured(trainer_id, after=after, limit=limit)
         
-        return jsonify({'captured': captured_names})
+        return jsonify({
+            'captured': [item['name'] for item in page['items']],
+            'items': page['items'],
+            'total': page['total'],
+            'next_cursor': page['next_cursor']
+        })
     
+    except (ValidationError, OverloadedError):
+        raise
     except Exception as e:
         logger.error(f"Error in get_captured_pokemon: {e}", exc_info=True)
-        if conn:
-            try:
-                return_db_connection(conn)
-            except:
-                pass
         raise
 
 
 @app.route('/api/pokemon/capture', methods=['POST'])
 def toggle_capture():
-    """Toggle capture status for a Pokemon."""
-    conn = None
+    """Toggle capture status for a Pokemon in the trainer's collection."""
     try:
+        trainer_id = get_trainer_id()
+        
         data = request.get_json()
         if not data:
             raise ValidationError("Request body is required")
@@ -240,36 +400,62 @@ def toggle_capture():
         if pokemon_name is None:
             raise ValidationError("Pokemon name is required")
         
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        if captured:
-            # Insert or update (ignore if already exists)
-            cursor.execute("""
-                INSERT INTO captured_pokemon (pokemon_name, captured_at)
-                VALUES (%s, CURRENT_TIMESTAMP)
-                ON CONFLICT (pokemon_name) DO NOTHING
-            """, (pokemon_name,))
-        else:
-            # Delete
-            cursor.execute("DELETE FROM captured_pokemon WHERE pokemon_name = %s", (pokemon_name,))
+        pokemon = get_index(get_cached_snapshot()).find(str(pokemon_name))
+        if pokemon is None or pokemon['name'].lower() != str(pokemon_name).lower():
+            raise NotFoundError(f"Pokemon not found: {pokemon_name}")
         
-        conn.commit()
-        cursor.close()
-        return_db_connection(conn)
+        set_captured(trainer_id, pokemon['number'], pokemon['name'], bool(captured))
         
         return jsonify({'success': True})
     
-    except ValidationError:
+    except (ValidationError, NotFoundError, OverloadedError):
         raise
     except Exception as e:
         logger.error(f"Error in toggle_capture: {e}", exc_info=True)
-        if conn:
-            try:
-                conn.rollback()
-                return_db_connection(conn)
-            except:
-                pass
+        raise
+
+
+@app.route('/api/pokemon/<number_or_name>', methods=['GET'])
+def get_pokemon_detail(number_or_name: str):
+    """Get a single Pokemon by number or case-insensitive name from the hash index."""
+    try:
+        index = get_index(get_cached_snapshot())
+        payload = index.find_json(number_or_name)
+        if payload is None:
+            raise NotFoundError(f"Pokemon not found: {number_or_name}")
+        
+        return Response(payload, mimetype='application/json')
+    
+    except (NotFoundError, OverloadedError):
+        raise
+    except Exception as e:
+        logger.error(f"Error in get_pokemon_detail: {e}", exc_info=True)
+        raise
+
+
+@app.route('/api/pokemon/multi-get', methods=['POST'])
+def multi_get_pokemon():
+    """Get several Pokemon by number or name in one request, in request order."""
+    try:
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict) or not isinstance(data.get('keys'), list):
+            raise ValidationError("Request body must contain a 'keys' list")
+        
+        keys = data['keys']
+        if len(keys) > MAX_MULTI_GET_KEYS:
+            raise ValidationError(f"At most {MAX_MULTI_GET_KEYS} keys are allowed")
+        
+        index = get_index(get_cached_snapshot())
+        found, missing = index.find_many_json(keys)
+        
+        # Records are already serialized - assemble the body without re-encoding them
+        payload = f'{{"missing":{json.dumps(missing)},"pokemon":[{",".join(found)}]}}'
+        return Response(payload, mimetype='application/json')
+    
+    except (ValidationError, OverloadedError):
+        raise
+    except Exception as e:
+        logger.error(f"Error in multi_get_pokemon: {e}", exc_info=True)
         raise
 
 
@@ -279,6 +465,8 @@ def get_pokemon_types():
     try:
         types = get_cached_types()
         return jsonify({'types': types})
+    except OverloadedError:
+        raise
     except Exception as e:
         logger.error(f"Error in get_pokemon_types: {e}", exc_info=True)
         raise
@@ -301,12 +489,31 @@ def invalidate_cache_endpoint():
         raise
 
 
+@app.route('/api/pokemon/reload', methods=['POST'])
+def reload_dataset_endpoint():
+    """Apply changes in pokemon_db.json to the cached dataset without a full reload."""
+    try:
+        force = request.args.get('force', 'false').lower() == 'true'
+        result = dataset.reload_from_file(force=force)
+        if not result['loaded']:
+            return jsonify({
+                'success': False,
+                'message': 'Dataset is not loaded yet - nothing to reload'
+            }), 409
+        return jsonify({'success': True, **result})
+    except Exception as e:
+        logger.error(f"Error in reload_dataset: {e}", exc_info=True)
+        raise
+
+
 @app.route('/')
 def hello():
     """Legacy endpoint - returns all Pokemon."""
     try:
-        data = db.get()
+        data = load_from_db()
         return jsonify(data)
+    except OverloadedError:
+        raise
     except Exception as e:
         logger.error(f"Error in legacy endpoint: {e}", exc_info=True)
         raise
@@ -329,7 +536,10 @@ if __name__ == '__main__':
     
     # Initialize connection pool
     logger.info("Initializing PostgreSQL connection pool...")
-    if not init_connection_pool(min_conn=1, max_conn=10):
+    if not init_connection_pool(
+        min_conn=int(os.getenv('DB_POOL_MIN', 1)),
+        max_conn=int(os.getenv('DB_POOL_MAX', 10))
+    ):
         logger.error("Failed to initialize PostgreSQL connection pool")
         exit(1)
     
@@ -337,9 +547,18 @@ if __name__ == '__main__':
     logger.info("Initializing Redis connection...")
     init_redis_connection(max_retries=3, retry_delay=1.0)
     
+    # Start background health prober (also warms the dataset cache)
+    logger.info("Starting background health prober...")
+    start_health_prober()
+    
+    # Watch pokemon_db.json and apply edits incrementally
+    dataset.start_dataset_watcher()
+    
     # Register cleanup on shutdown
     import atexit
     atexit.register(close_connection_pool)
+    atexit.register(stop_health_prober)
+    atexit.register(dataset.stop_dataset_watcher)
     
     port = int(os.getenv('PORT', 8080))
     logger.info(f"Server starting on port {port}")
@@ -0,0 +1,7 @@
+"""
+Reproducible benchmark suite for the Pokédex API server.
+
+Run from the server directory:
+
+    python -m benchmarks.run --sizes 800,10000,100000 --output bench.json
+"""
@@ -0,0 +1,66 @@
+"""
+End-to-end endpoint benchmarks through the WSGI test client.
+"""
+from typing import Any, Dict, List
+
+from werkzeug.test import Client
+
+import cache
+from app import app
+from benchmarks.harness import measure
+
+# Trainer whose collection is pre-populated for the captured list benchmarks
+BENCH_TRAINER_ID = 1
+
+
+def run(size: int, min_time: float, repeat: int) -> List[Dict[str, Any]]:
+    """Run endpoint benchmarks against an already configured dataset."""
+    # werkzeug's Client directly: Flask 2.0's test_client() passes a keyword
+    # that the pinned Werkzeug no longer accepts.
+    client = Client(app, app.response_class)
+    results = []
+
+    def bench_get(path: str, headers=None):
+        def request():
+            response = client.get(path, headers=headers)
+            if response.status_code != 200:
+                raise RuntimeError(f"GET {path} returned {response.status_code}")
+        results.append(measure('GET ' + path.split('?')[0], request, min_time, repeat,
+                               size=size, path=path))
+
+    bench_get('/api/pokemon')
+    bench_get('/api/pokemon?page=3&page_size=20&sort=desc')
+    bench_get('/api/pokemon?type=fire')
+    bench_get('/api/pokemon?search=char')
+    bench_get('/api/pokemon?type=water&search=a&sort=desc')
+    bench_get('/api/pokemon/types')
+    bench_get('/api/pokemon/25')
+    bench_get('/api/pokemon/pikachu')
+    bench_get('/api/pokemon/captured')
+
+    trainer = {'X-Trainer-Id': str(BENCH_TRAINER_ID)}
+    for pokemon in cache.get_cached_pokemon()[:500]:
+        client.post('/api/pokemon/capture', json={'name': pokemon['name'], 'captured': True},
+                    headers=trainer)
+    bench_get('/api/pokemon/captured?limit=100', headers=trainer)
+    bench_get('/api/pokemon/captured?limit=1000', headers=trainer)
+
+    keys = [pokemon['name'] for pokemon in cache.get_cached_pokemon()[:100]]
+
+    def multi_get():
+        response = client.post('/api/pokemon/multi-get', json={'keys': keys})
+        if response.status_code != 200:
+            raise RuntimeError(f"POST /api/pokemon/multi-get returned {response.status_code}")
+    results.append(measure('POST /api/pokemon/multi-get (100 keys)', multi_get, min_time, repeat,
+                           size=size))
+
+    def toggle_capture():
+        for captured in (True, False):
+            response = client.post('/api/pokemon/capture',
+                                   json={'name': 'Pikachu', 'captured': captured})
+            if response.status_code != 200:
+                raise RuntimeError(f"POST /api/pokemon/capture returned {response.status_code}")
+    results.append(measure('POST /api/pokemon/capture (x2)', toggle_capture, min_time, repeat,
+                           size=size))
+
+    return results
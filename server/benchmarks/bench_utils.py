@@ -0,0 +1,84 @@
+"""
+Microbenchmarks for utils.py, the cache read path and dataset reloads.
+"""
+import json
+import os
+import shutil
+import tempfile
+from typing import Any, Dict, List
+
+import cache
+import dataset
+import db
+from benchmarks.harness import measure
+from utils import filter_by_type, fuzzy_search, sort_pokemon
+
+
+def run(pokemon: List[Dict[str, Any]], size: int, min_time: float, repeat: int) -> List[Dict[str, Any]]:
+    """Run the utils and cache microbenchmarks against an already configured dataset."""
+    results = []
+
+    def bench(name, func, **params):
+        results.append(measure(name, func, min_time, repeat, size=size, **params))
+
+    bench('utils.filter_by_type', lambda: filter_by_type(pokemon, 'fire'), type='fire')
+    bench('utils.fuzzy_search', lambda: fuzzy_search(pokemon, 'char'), query='char')
+    bench('utils.fuzzy_search', lambda: fuzzy_search(pokemon, 'zzz'), query='zzz')
+    bench('utils.fuzzy_search', lambda: fuzzy_search(pokemon, '25'), query='25')
+    bench('utils.sort_pokemon', lambda: sort_pokemon(pokemon, 'asc'), direction='asc')
+    bench('utils.sort_pokemon', lambda: sort_pokemon(pokemon, 'desc'), direction='desc')
+
+    def cold_fetch():
+        cache.invalidate_cache()
+        cache.get_cached_pokemon()
+    bench('cache.get_cached_pokemon', cold_fetch, state='cold')
+
+    def redis_fetch():
+        dataset.clear_snapshot()
+        cache.get_cached_pokemon()
+    cache.get_cached_pokemon()  # populate the fake Redis
+    bench('cache.get_cached_pokemon', redis_fetch, state='redis')
+
+    cache.get_cached_pokemon()
+    bench('cache.get_cached_pokemon', cache.get_cached_pokemon, state='warm')
+    bench('cache.get_cached_types', cache.get_cached_types, state='warm')
+
+    results.extend(_bench_reload(size, min_time, repeat))
+    return results
+
+
+def _bench_reload(size: int, min_time: float, repeat: int) -> List[Dict[str, Any]]:
+    """Time incremental reloads against a scratch copy of the dataset file."""
+    source_path = db.DB_PATH
+    scratch_dir = tempfile.mkdtemp(prefix='pokedex-bench-')
+    scratch_path = os.path.join(scratch_dir, 'pokemon_db.json')
+    shutil.copyfile(source_path, scratch_path)
+
+    with open(scratch_path, 'rb') as f:
+        original = f.read()
+    records = json.loads(original)
+    records[len(records) // 2]['attack'] += 1
+    edited = json.dumps(records).encode()
+
+    results = []
+    try:
+        db.DB_PATH = scratch_path
+        dataset.reload_from_file(force=True)
+        results.append(measure('dataset.reload_from_file', dataset.reload_from_file,
+                               min_time, repeat, size=size, change='none'))
+
+        contents = [edited, original]
+
+        def reload_one_edit():
+            contents.reverse()
+            with open(scratch_path, 'wb') as f:
+                f.write(contents[0])
+            dataset.reload_from_file(force=True)
+        results.append(measure('dataset.reload_from_file', reload_one_edit,
+                               min_time, repeat, size=size, change='one_record'))
+    finally:
+        db.DB_PATH = source_path
+        shutil.rmtree(scratch_dir, ignore_errors=True)
+        dataset.reload_from_file(force=True)
+
+    return results
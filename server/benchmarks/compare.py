@@ -0,0 +1,40 @@
+"""
+Compare two benchmark result files and flag regressions.
+
+    python -m benchmarks.compare baseline.json current.json --threshold 1.10
+"""
+import argparse
+import json
+import sys
+from typing import Any, Dict, Tuple
+
+
+def _key(result: Dict[str, Any]) -> Tuple[str, str]:
+    return result['name'], json.dumps(result['params'], sort_keys=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Compare two benchmark JSON files')
+    parser.add_argument('baseline')
+    parser.add_argument('current')
+    parser.add_argument('--threshold', type=float, default=1.10,
+                        help='Median ratio above which a benchmark counts as a regression')
+    args = parser.parse_args()
+
+    with open(args.baseline) as f:
+        baseline = {_key(r): r for r in json.load(f)['results']}
+    with open(args.current) as f:
+        current = {_key(r): r for r in json.load(f)['results']}
+
+    regressions = 0
+    for key in sorted(baseline.keys() & current.keys()):
+        ratio = current[key]['median'] / baseline[key]['median']
+        flag = 'REGRESSION' if ratio > args.threshold else ''
+        regressions += bool(flag)
+        print(f"{ratio:6.2f}x  {key[0]:<32} {key[1]}  {flag}")
+
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""
+Synthetic dataset generator that scales pokemon_db.json to arbitrary sizes.
+"""
+import argparse
+import json
+import os
+import random
+from typing import Any, Dict, List
+
+import db
+
+STAT_FIELDS = ('hit_points', 'attack', 'defense', 'special_attack', 'special_defense', 'speed')
+
+
+def load_base_dataset(path: str = db.DB_PATH) -> List[Dict[str, Any]]:
+    """Load the real Pokemon dataset used as the template for synthetic rows."""
+    with open(path, 'rb') as f:
+        return json.loads(f.read())
+
+
+def generate_dataset(size: int, seed: int = 42, base: List[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    """
+    Scale the base dataset to `size` rows.
+
+    The first pass reproduces the real dataset. Every further pass shifts
+    `number` past the real range and suffixes `name`, so names stay unique and
+    the duplicate-number structure (mega forms) is preserved. Stats are
+    jittered with a seeded RNG so runs are reproducible.
+
+    Args:
+        size: Number of rows to generate
+        seed: Random seed for stat jitter
+        base: Template rows (defaults to pokemon_db.json)
+
+    Returns:
+        List of Pokemon dictionaries
+    """
+    base = base if base is not None else load_base_dataset()
+    rng = random.Random(seed)
+    number_span = max(p['number'] for p in base)
+    rows = []
+
+    for i in range(size):
+        cycle, offset = divmod(i, len(base))
+        row = dict(base[offset])
+        if cycle > 0:
+            row['number'] = row['number'] + cycle * number_span
+            row['name'] = f"{row['name']} {cycle}"
+            for field in STAT_FIELDS:
+                row[field] = max(1, row[field] + rng.randint(-10, 10))
+            row['total'] = sum(row[field] for field in STAT_FIELDS)
+        rows.append(row)
+
+    return rows
+
+
+def write_dataset(size: int, output_dir: str, seed: int = 42) -> str:
+    """
+    Generate a dataset and write it to `output_dir`, reusing an existing file.
+
+    Returns:
+        Path of the JSON file
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    path = os.path.join(output_dir, f"pokemon_{size}_{seed}.json")
+    if not os.path.exists(path):
+        with open(path, 'w') as f:
+            json.dump(generate_dataset(size, seed), f)
+    return path
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Generate a scaled synthetic Pokemon dataset')
+    parser.add_argument('size', type=int, help='Number of rows (800 - 1000000)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output-dir', default=os.path.join(os.path.dirname(__file__), 'data'))
+    args = parser.parse_args()
+    print(write_dataset(args.size, args.output_dir, args.seed))
@@ -0,0 +1,143 @@
+"""
+In-memory stand-ins for Redis and the PostgreSQL pool used by the benchmarks.
+
+They implement only the calls the server makes, with no network latency, so
+endpoint benchmarks measure the Python code paths rather than the services.
+"""
+import datetime
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class FakeRedis:
+    """Dict-backed subset of the redis.Redis client API."""
+
+    def __init__(self):
+        self._data: Dict[str, Tuple[Any, Optional[float]]] = {}
+
+    def _live(self, key: str):
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and time.monotonic() >= expires_at:
+            del self._data[key]
+            return None
+        return value
+
+    def ping(self) -> bool:
+        return True
+
+    def get(self, key: str):
+        return self._live(key)
+
+    def set(self, key: str, value) -> bool:
+        self._data[key] = (value, None)
+        return True
+
+    def setex(self, key: str, ttl: int, value) -> bool:
+        self._data[key] = (value, time.monotonic() + ttl)
+        return True
+
+    def exists(self, *keys: str) -> int:
+        return sum(1 for key in keys if self._live(key) is not None)
+
+    def delete(self, *keys: str) -> int:
+        return sum(1 for key in keys if self._data.pop(key, None) is not None)
+
+    def flushdb(self) -> bool:
+        self._data.clear()
+        return True
+
+
+class FakeCursor:
+    """Cursor that understands the handful of statements issued by the server."""
+
+    def __init__(self, store: 'FakeConnectionPool'):
+        self._store = store
+        self._results: List[tuple] = []
+        self.rowcount = -1
+        self.itersize = 2000
+
+    def execute(self, query: str, params: tuple = ()) -> None:
+        statement = ' '.join(query.split()).upper()
+        self._results = []
+        self.rowcount = 0
+
+        if statement.startswith('SELECT 1'):
+            self._results = [(1,)]
+        elif statement.startswith('SELECT POKEMON_NUMBER, POKEMON_NAME, CAPTURED_AT'):
+            trainer_id, *after, limit = params
+            rows = sorted(
+                (number, name, captured_at)
+                for (number, name), captured_at in self._store.captured.get(trainer_id, {}).items()
+            )
+            if after:
+                rows = [row for row in rows if (row[0], row[1]) > tuple(after)]
+            self._results = rows[:limit]
+        elif statement.startswith('INSERT INTO TRAINER_CAPTURED_POKEMON'):
+            trainer_id, number, name = params
+            collection = self._store.captured.setdefault(trainer_id, {})
+            if (number, name) not in collection:
+                collection[(number, name)] = datetime.datetime.now()
+                self.rowcount = 1
+        elif statement.startswith('DELETE FROM TRAINER_CAPTURED_POKEMON'):
+            trainer_id, number, name = params
+            if self._store.captured.get(trainer_id, {}).pop((number, name), None) is not None:
+                self.rowcount = 1
+        elif statement.startswith('INSERT INTO TRAINER_CAPTURE_COUNTS'):
+            trainer_id, delta = params
+            self._store.counts[trainer_id] = self._store.counts.get(trainer_id, 0) + delta
+            self.rowcount = 1
+        elif statement.startswith('SELECT CAPTURED_COUNT FROM TRAINER_CAPTURE_COUNTS'):
+            trainer_id = params[0]
+            if trainer_id in self._store.counts:
+                self._results = [(self._store.counts[trainer_id],)]
+        else:
+            raise NotImplementedError(f"FakeCursor does not support: {query}")
+
+        if self._results:
+            self.rowcount = len(self._results)
+
+    def __iter__(self):
+        return iter(list(self._results))
+
+    def fetchone(self):
+        return self._results[0] if self._results else None
+
+    def fetchall(self) -> List[tuple]:
+        return list(self._results)
+
+    def close(self) -> None:
+        pass
+
+
+class FakeConnection:
+    def __init__(self, store: 'FakeConnectionPool'):
+        self._store = store
+
+    def cursor(self, *args, **kwargs) -> FakeCursor:
+        return FakeCursor(self._store)
+
+    def commit(self) -> None:
+        pass
+
+    def rollback(self) -> None:
+        pass
+
+
+class FakeConnectionPool:
+    """Subset of psycopg2.pool.ThreadedConnectionPool backed by in-memory tables."""
+
+    def __init__(self):
+        self.captured: Dict[int, Dict[Tuple[int, str], datetime.datetime]] = {}
+        self.counts: Dict[int, int] = {}
+
+    def getconn(self) -> FakeConnection:
+        return FakeConnection(self)
+
+    def putconn(self, conn: FakeConnection, close: bool = False) -> None:
+        pass
+
+    def closeall(self) -> None:
+        pass
@@ -0,0 +1,73 @@
+"""
+Timing harness and server wiring shared by the benchmark suites.
+"""
+import statistics
+import time
+from typing import Any, Callable, Dict
+
+import cache
+import database
+import dataset
+import db
+from benchmarks.fakes import FakeConnectionPool, FakeRedis
+
+
+def measure(name: str, func: Callable[[], Any], min_time: float = 0.2, repeat: int = 5,
+            **params: Any) -> Dict[str, Any]:
+    """
+    Time `func`, calibrating the loop count so each repeat runs for about `min_time`.
+
+    Args:
+        name: Benchmark name
+        func: Zero-argument callable to time
+        min_time: Target duration of a single repeat in seconds
+        repeat: Number of timed repeats
+        **params: Parameters recorded alongside the result (dataset size, query...)
+
+    Returns:
+        Result dictionary with per-call timings in seconds
+    """
+    func()  # warm up
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or number >= 1_000_000:
+            break
+        number *= 2 if elapsed <= 0 else max(2, min(10, int(min_time / elapsed) + 1))
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append((time.perf_counter() - start) / number)
+
+    return {
+        'name': name,
+        'params': params,
+        'number': number,
+        'repeat': repeat,
+        'min': min(timings),
+        'median': statistics.median(timings),
+        'mean': statistics.fmean(timings),
+        'stdev': statistics.stdev(timings) if len(timings) > 1 else 0.0,
+    }
+
+
+def configure_server(dataset_path: str) -> None:
+    """
+    Point the server modules at a synthetic dataset and in-memory Redis/Postgres.
+
+    db.QUERY_EXECUTION_TIME is zeroed for the benchmark process only: the
+    artificial sleep is constant and would otherwise dominate every cold load.
+    """
+    db.DB_PATH = dataset_path
+    db.QUERY_EXECUTION_TIME = 0
+    cache._redis_client = FakeRedis()
+    cache._redis_enabled = True
+    cache._cache_ttl = 24 * 60 * 60
+    database._db_pool = FakeConnectionPool()
+    dataset.clear_snapshot()
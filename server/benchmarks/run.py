@@ -0,0 +1,88 @@
+"""
+Benchmark runner: generates datasets, runs all suites and writes JSON results.
+"""
+import argparse
+import datetime
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+from typing import Any, Dict, List
+
+from benchmarks import bench_endpoints, bench_utils
+from benchmarks.dataset import write_dataset
+from benchmarks.harness import configure_server
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', 'HEAD'], cwd=os.path.dirname(__file__), stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except Exception:
+        return 'unknown'
+
+
+def run_benchmarks(sizes: List[int], suites: List[str], min_time: float, repeat: int,
+                   seed: int) -> Dict[str, Any]:
+    """Run the selected suites for every dataset size."""
+    import cache
+
+    results = []
+    for size in sizes:
+        dataset_path = write_dataset(size, DATA_DIR, seed)
+        configure_server(dataset_path)
+        pokemon = cache.get_cached_pokemon()
+        print(f"[{size} rows] running {', '.join(suites)}", file=sys.stderr)
+
+        if 'utils' in suites:
+            results.extend(bench_utils.run(pokemon, size, min_time, repeat))
+        if 'endpoints' in suites:
+            results.extend(bench_endpoints.run(size, min_time, repeat))
+
+    return {
+        'commit': _git_commit(),
+        'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'seed': seed,
+        'results': results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Run the Pokédex server benchmarks')
+    parser.add_argument('--sizes', default='800,10000,100000',
+                        help='Comma separated dataset sizes (up to 1000000)')
+    parser.add_argument('--suites', default='utils,endpoints',
+                        help='Comma separated suites: utils, endpoints')
+    parser.add_argument('--min-time', type=float, default=0.2,
+                        help='Target seconds per timed repeat')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='Write JSON results to this file instead of stdout')
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    report = run_benchmarks(
+        sizes=[int(size) for size in args.sizes.split(',')],
+        suites=args.suites.split(','),
+        min_time=args.min_time,
+        repeat=args.repeat,
+        seed=args.seed,
+    )
+
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(payload)
+    else:
+        print(payload)
+
+
+if __name__ == '__main__':
+    main()
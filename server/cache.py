@@ -9,10 +9,32 @@ from typing import Optional, List, Dict, Any
 import redis
 from redis.exceptions import ConnectionError, TimeoutError, RedisError
 
+import dataset
 import db
+import metrics
+from admission import OverloadedError, db_load_limiter
 
 logger = logging.getLogger(__name__)
 
+CACHE_LOOKUPS = metrics.counter(
+    'pokedex_cache_lookups_total',
+    'Cache lookups by layer, key and result',
+    ['layer', 'key', 'result']
+)
+CACHE_OPERATION_SECONDS = metrics.histogram(
+    'pokedex_cache_operation_duration_seconds',
+    'Time spent in cache operations (Redis round trips, JSON parse and serialize)',
+    ['operation']
+)
+DB_LOADS = metrics.counter(
+    'pokedex_db_loads_total',
+    'Number of full dataset loads through db.get()'
+)
+DB_LOAD_SECONDS = metrics.histogram(
+    'pokedex_db_load_duration_seconds',
+    'Duration of db.get() dataset loads'
+)
+
 # Redis connection
 _redis_client: Optional[redis.Redis] = None
 _cache_ttl: int = int(os.getenv('POKEMON_CACHE_TTL', 120))
@@ -91,8 +113,9 @@ def check_redis_health() -> bool:
 
 def get_cached_pokemon() -> List[Dict[str, Any]]:
     """
-    Get Pokemon data from Redis cache or fetch from DB.
-    Falls back to DB if Redis is unavailable.
+    Get Pokemon data from the in-process snapshot, Redis cache or DB.
+    Falls back to the last known good copy if Redis is unavailable (or the
+    db.get() queue is full), and to DB if there is none.
     
     Returns:
         List of Pokemon dictionaries
@@ -101,32 +124,90 @@ def get_cached_pokemon() -> List[Dict[str, Any]]:
     
     cache_key = 'pokemon:all'
     
+    # Try the in-process snapshot first (kept current by the dataset watcher)
+    snapshot = dataset.get_snapshot()
+    if snapshot is not None:
+        CACHE_LOOKUPS.inc(layer='l1', key=cache_key, result='hit')
+        return snapshot.records
+    CACHE_LOOKUPS.inc(layer='l1', key=cache_key, result='miss')
+    
     # Try to get from cache
     if _redis_enabled and _redis_client is not None:
         try:
-            cached = _redis_client.get(cache_key)
+            with CACHE_OPERATION_SECONDS.time(operation='redis_get'):
+                cached = _redis_client.get(cache_key)
             if cached:
                 logger.debug("Cache hit for pokemon:all")
-                return json.loads(cached)
+                CACHE_LOOKUPS.inc(layer='redis', key=cache_key, result='hit')
+                with CACHE_OPERATION_SECONDS.time(operation='parse'):
+                    pokemon_data = json.loads(cached)
+                return dataset.install_snapshot(pokemon_data).records
+            CACHE_LOOKUPS.inc(layer='redis', key=cache_key, result='miss')
         except (ConnectionError, TimeoutError, RedisError) as e:
             logger.warning(f"Redis error while getting cache: {e}. Falling back to DB.")
+            CACHE_LOOKUPS.inc(layer='redis', key=cache_key, result='error')
             _redis_enabled = False
         except Exception as e:
             logger.error(f"Unexpected Redis error: {e}. Falling back to DB.")
+            CACHE_LOOKUPS.inc(layer='redis', key=cache_key, result='error')
+    
+    # Redis unavailable - serve the last known good copy rather than queueing for db.get()
+    last_known_good = dataset.get_last_known_good()
+    if last_known_good is not None and not (_redis_enabled and _redis_client is not None):
+        CACHE_LOOKUPS.inc(layer='last_known_good', key=cache_key, result='hit')
+        logger.debug("Redis unavailable - serving last known good dataset")
+        return last_known_good.records
     
     # Cache miss or Redis unavailable - fetch from DB
     logger.debug("Cache miss or Redis unavailable - fetching from DB")
-    pokemon_data = db.get()
+    try:
+        with db_load_limiter.slot():
+            # Another request may have loaded the dataset while this one queued
+            snapshot = dataset.get_snapshot()
+            if snapshot is not None:
+                return snapshot.records
+            pokemon_data = _timed_db_get()
+            snapshot = dataset.install_snapshot(pokemon_data)
+    except OverloadedError:
+        if last_known_good is None:
+            raise
+        CACHE_LOOKUPS.inc(layer='last_known_good', key=cache_key, result='hit')
+        logger.warning("db.get() queue full - serving last known good dataset")
+        return last_known_good.records
     
     # Try to store in cache (non-blocking)
-    if _redis_enabled and _redis_client is not None:
-        try:
-            _redis_client.setex(cache_key, _cache_ttl, json.dumps(pokemon_data))
-            logger.debug(f"Cached pokemon data with TTL {_cache_ttl}s")
-        except Exception as e:
-            logger.warning(f"Failed to cache Pokemon data: {e}")
+    _store_pokemon(pokemon_data)
     
-    return pokemon_data
+    return snapshot.records
+
+
+def get_cached_snapshot() -> dataset.DatasetSnapshot:
+    """
+    Get the dataset snapshot backing get_cached_pokemon(), loading it if needed.
+    
+    Returns:
+        Current snapshot (or the last known good one while Redis is down)
+    """
+    snapshot = dataset.get_snapshot()
+    if snapshot is None:
+        get_cached_pokemon()
+        snapshot = dataset.get_last_known_good()
+    return snapshot
+
+
+def _store_pokemon(pokemon_data: List[Dict[str, Any]]) -> None:
+    """Write the full dataset to Redis, logging (not raising) on failure."""
+    if not _redis_enabled or _redis_client is None:
+        return
+    
+    try:
+        with CACHE_OPERATION_SECONDS.time(operation='serialize'):
+            payload = json.dumps(pokemon_data)
+        with CACHE_OPERATION_SECONDS.time(operation='redis_set'):
+            _redis_client.setex('pokemon:all', _cache_ttl, payload)
+        logger.debug(f"Cached pokemon data with TTL {_cache_ttl}s")
+    except Exception as e:
+        logger.warning(f"Failed to cache Pokemon data: {e}")
 
 
 def get_cached_types() -> List[str]:
@@ -141,17 +222,27 @@ def get_cached_types() -> List[str]:
     
     cache_key = 'pokemon:types'
     
+    # Types are maintained incrementally on the in-process snapshot
+    snapshot = dataset.get_snapshot()
+    if snapshot is not None:
+        return snapshot.types
+    
     # Try to get from cache
     if _redis_enabled and _redis_client is not None:
         try:
-            cached = _redis_client.get(cache_key)
+            with CACHE_OPERATION_SECONDS.time(operation='redis_get'):
+                cached = _redis_client.get(cache_key)
             if cached:
                 logger.debug("Cache hit for pokemon:types")
+                CACHE_LOOKUPS.inc(layer='redis', key=cache_key, result='hit')
                 return json.loads(cached)
+            CACHE_LOOKUPS.inc(layer='redis', key=cache_key, result='miss')
         except (ConnectionError, TimeoutError, RedisError) as e:
             logger.warning(f"Redis error while getting types cache: {e}")
+            CACHE_LOOKUPS.inc(layer='redis', key=cache_key, result='error')
         except Exception as e:
             logger.error(f"Unexpected Redis error: {e}")
+            CACHE_LOOKUPS.inc(layer='redis', key=cache_key, result='error')
     
     # Cache miss - extract types from Pokemon data
     logger.debug("Cache miss for types - extracting from Pokemon data")
@@ -179,13 +270,15 @@ def get_cached_types() -> List[str]:
 
 def invalidate_cache() -> bool:
     """
-    Invalidate Redis cache for Pokemon data and types.
+    Invalidate the in-process snapshot and Redis cache for Pokemon data and types.
     
     Returns:
         True if successful, False otherwise
     """
     global _redis_client, _redis_enabled
     
+    dataset.clear_snapshot()
+    
     if not _redis_enabled or _redis_client is None:
         logger.warning("Cannot invalidate cache - Redis not available")
         return False
@@ -208,3 +301,67 @@ def is_redis_enabled() -> bool:
         True if Redis is enabled and available, False otherwise
     """
     return _redis_enabled and _redis_client is not None
+
+
+def is_dataset_cache_warm() -> bool:
+    """
+    Check whether the Pokemon dataset is loaded in-process.
+    
+    Returns:
+        True if the snapshot (or the last known good copy) can serve reads, False otherwise
+    """
+    return dataset.get_last_known_good() is not None
+
+
+def warm_cache() -> bool:
+    """
+    Load the in-process dataset if it is missing, from Redis or through db.get().
+    
+    Returns:
+        True if the dataset is loaded afterwards, False otherwise
+    """
+    if dataset.get_snapshot() is not None:
+        return True
+    
+    try:
+        get_cached_pokemon()
+        get_cached_types()
+    except Exception as e:
+        logger.error(f"Failed to warm cache: {e}")
+        return False
+    
+    return is_dataset_cache_warm()
+
+
+def load_from_db() -> List[Dict[str, Any]]:
+    """
+    Load the full Pokemon dataset through db.get() under the db.get() concurrency limit.
+
+    Returns:
+        List of Pokemon dictionaries
+
+    Raises:
+        OverloadedError: If the db.get() wait queue is full
+    """
+    with db_load_limiter.slot():
+        return _timed_db_get()
+
+
+def _timed_db_get() -> List[Dict[str, Any]]:
+    """Call db.get(), recording load metrics."""
+    DB_LOADS.inc()
+    with DB_LOAD_SECONDS.time():
+        return db.get()
+
+
+def _sync_redis_copy(snapshot: dataset.DatasetSnapshot, diff: dataset.DatasetDiff) -> None:
+    """Dataset change listener: refresh the Redis copy after an incremental reload."""
+    _store_pokemon(snapshot.records)
+    if _redis_enabled and _redis_client is not None:
+        try:
+            _redis_client.setex('pokemon:types', _cache_ttl, json.dumps(snapshot.types))
+        except Exception as e:
+            logger.warning(f"Failed to cache types data: {e}")
+
+
+dataset.add_change_listener(_sync_redis_copy)
@@ -0,0 +1,189 @@
+"""
+Trainer-scoped captured Pokemon storage with keyset pagination.
+"""
+import base64
+import logging
+import os
+from typing import Any, Dict, Optional, Tuple
+
+from database import get_db_connection, return_db_connection
+
+logger = logging.getLogger(__name__)
+
+# Rows fetched per round trip by the server-side cursor
+_fetch_size: int = int(os.getenv('CAPTURED_FETCH_SIZE', 500))
+
+MAX_PAGE_SIZE = 1000
+
+
+def encode_cursor(pokemon_number: int, pokemon_name: str) -> str:
+    """
+    Encode the last (number, name) key of a page as an opaque cursor.
+
+    Args:
+        pokemon_number: Number of the last row on the page
+        pokemon_name: Name of the last row on the page
+
+    Returns:
+        URL-safe cursor string
+    """
+    raw = f"{pokemon_number}:{pokemon_name}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[int, str]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        number, name = raw.split(':', 1)
+        return int(number), name
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def list_captured(
+    trainer_id: int,
+    after: Optional[Tuple[int, str]] = None,
+    limit: int = MAX_PAGE_SIZE
+) -> Dict[str, Any]:
+    """
+    Read one keyset page of a trainer's captured Pokemon, ordered by number.
+
+    The read walks the (trainer_id, pokemon_number, pokemon_name) primary key
+    from the cursor position, so its cost depends on the page size rather
+    than on how deep the page is or how large the table grows.
+
+    Args:
+        trainer_id: Trainer whose collection to read
+        after: (number, name) key of the last row of the previous page
+        limit: Maximum rows to return
+
+    Returns:
+        Dictionary with 'items', 'total' and 'next_cursor' (None on the last page)
+    """
+    conn = None
+    discard = False
+    try:
+        conn = get_db_connection()
+
+        # Server-side cursor: rows stream in _fetch_size batches instead of
+        # being materialized client-side in one go
+        cursor = conn.cursor(name='captured_keyset')
+        cursor.itersize = _fetch_size
+        if after is None:
+            cursor.execute("""
+                SELECT pokemon_number, pokemon_name, captured_at
+                FROM trainer_captured_pokemon
+                WHERE trainer_id = %s
+                ORDER BY pokemon_number, pokemon_name
+                LIMIT %s
+            """, (trainer_id, limit + 1))
+        else:
+            cursor.execute("""
+                SELECT pokemon_number, pokemon_name, captured_at
+                FROM trainer_captured_pokemon
+                WHERE trainer_id = %s AND (pokemon_number, pokemon_name) > (%s, %s)
+                ORDER BY pokemon_number, pokemon_name
+                LIMIT %s
+            """, (trainer_id, after[0], after[1], limit + 1))
+        rows = list(cursor)
+        cursor.close()
+
+        count_cursor = conn.cursor()
+        count_cursor.execute(
+            "SELECT captured_count FROM trainer_capture_counts WHERE trainer_id = %s",
+            (trainer_id,)
+        )
+        count_row = count_cursor.fetchone()
+        count_cursor.close()
+
+        conn.commit()
+    except Exception:
+        if conn:
+            try:
+                conn.rollback()
+            except Exception:
+                # Broken connection - close it instead of handing it to the next caller
+                discard = True
+        raise
+    finally:
+        if conn:
+            return_db_connection(conn, close=discard)
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    items = [
+        {
+            'number': number,
+            'name': name,
+            'captured_at': captured_at.isoformat() if captured_at else None
+        }
+        for number, name, captured_at in rows
+    ]
+    return {
+        'items': items,
+        'total': count_row[0] if count_row else 0,
+        'next_cursor': encode_cursor(rows[-1][0], rows[-1][1]) if has_more else None
+    }
+
+
+def set_captured(trainer_id: int, pokemon_number: int, pokemon_name: str, captured: bool) -> bool:
+    """
+    Capture or release a Pokemon for a trainer, keeping the trainer's count in sync.
+
+    Args:
+        trainer_id: Trainer performing the toggle
+        pokemon_number: Pokemon number
+        pokemon_name: Pokemon name (distinguishes forms sharing a number)
+        captured: True to capture, False to release
+
+    Returns:
+        True if the collection changed, False if it was already in that state
+    """
+    conn = None
+    discard = False
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+
+        if captured:
+            cursor.execute("""
+                INSERT INTO trainer_captured_pokemon (trainer_id, pokemon_number, pokemon_name)
+                VALUES (%s, %s, %s)
+                ON CONFLICT DO NOTHING
+            """, (trainer_id, pokemon_number, pokemon_name))
+        else:
+            cursor.execute("""
+                DELETE FROM trainer_captured_pokemon
+                WHERE trainer_id = %s AND pokemon_number = %s AND pokemon_name = %s
+            """, (trainer_id, pokemon_number, pokemon_name))
+        changed = cursor.rowcount == 1
+
+        if changed:
+            cursor.execute("""
+                INSERT INTO trainer_capture_counts (trainer_id, captured_count)
+                VALUES (%s, %s)
+                ON CONFLICT (trainer_id)
+                DO UPDATE SET captured_count = trainer_capture_counts.captured_count + EXCLUDED.captured_count
+            """, (trainer_id, 1 if captured else -1))
+
+        conn.commit()
+        cursor.close()
+        return changed
+    except Exception:
+        if conn:
+            try:
+                conn.rollback()
+            except Exception:
+                # Broken connection - close it instead of handing it to the next caller
+                discard = True
+        raise
+    finally:
+        if conn:
+            return_db_connection(conn, close=discard)
+
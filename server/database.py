@@ -3,13 +3,37 @@ PostgreSQL database connection pool management.
 """
 import os
 import logging
+import threading
 from typing import Optional
 from psycopg2 import pool
 
+import metrics
+from admission import ConcurrencyLimiter, OverloadedError, create_pool_limiter
+
 logger = logging.getLogger(__name__)
 
 # Global connection pool
 _db_pool: Optional[pool.ThreadedConnectionPool] = None
+_pool_max_conn: int = 0
+_pool_in_use: int = 0
+_pool_lock = threading.Lock()
+_pool_limiter: Optional[ConcurrencyLimiter] = None
+
+POOL_ACQUIRE_SECONDS = metrics.histogram(
+    'pokedex_db_pool_acquire_duration_seconds',
+    'Time spent acquiring a connection from the PostgreSQL pool'
+)
+POOL_ACQUIRE_FAILURES = metrics.counter(
+    'pokedex_db_pool_acquire_failures_total',
+    'Failed attempts to acquire a connection from the PostgreSQL pool'
+)
+POOL_CONNECTIONS = metrics.gauge(
+    'pokedex_db_pool_connections',
+    'PostgreSQL pool connections by state',
+    ['state']
+)
+POOL_CONNECTIONS.set_function(lambda: _pool_in_use, state='in_use')
+POOL_CONNECTIONS.set_function(lambda: _pool_max_conn, state='max')
 
 
 def init_connection_pool(min_conn: int = 1, max_conn: int = 10) -> bool:
@@ -23,7 +47,7 @@ def init_connection_pool(min_conn: int = 1, max_conn: int = 10) -> bool:
     Returns:
         True if pool initialized successfully, False otherwise
     """
-    global _db_pool
+    global _db_pool, _pool_max_conn, _pool_in_use, _pool_limiter
     
     try:
         _db_pool = pool.ThreadedConnectionPool(
@@ -35,6 +59,9 @@ def init_connection_pool(min_conn: int = 1, max_conn: int = 10) -> bool:
             password=os.getenv('DB_PASSWORD', 'postgres'),
             database=os.getenv('DB_NAME', 'app_db')
         )
+        _pool_max_conn = max_conn
+        _pool_in_use = 0
+        _pool_limiter = create_pool_limiter(max_conn)
         logger.info(f"PostgreSQL connection pool initialized (min={min_conn}, max={max_conn})")
         return True
     except Exception as e:
@@ -43,52 +70,79 @@ def init_connection_pool(min_conn: int = 1, max_conn: int = 10) -> bool:
         return False
 
 
-def get_db_connection():
+def get_db_connection(wait: bool = True):
     """
     Get a connection from the connection pool.
     
+    Args:
+        wait: Queue for a connection when all are in use (False fails immediately)
+    
     Returns:
         Database connection object
         
     Raises:
         RuntimeError: If pool is not initialized
+        OverloadedError: If the pool is exhausted and its wait queue is full
+            (or, with wait=False, if no connection is free right now)
         psycopg2.Error: If connection cannot be obtained
     """
-    global _db_pool
+    global _db_pool, _pool_in_use
     
     if _db_pool is None:
         raise RuntimeError("Database connection pool not initialized")
     
+    # Queue (bounded) for a free connection instead of hitting PoolError
+    if _pool_limiter is not None:
+        if wait:
+            _pool_limiter.acquire()
+        elif not _pool_limiter.try_acquire():
+            raise OverloadedError(_pool_limiter.name, _pool_limiter.retry_after)
+    
     try:
-        return _db_pool.getconn()
+        with POOL_ACQUIRE_SECONDS.time():
+            conn = _db_pool.getconn()
     except Exception as e:
+        if _pool_limiter is not None:
+            _pool_limiter.release()
+        POOL_ACQUIRE_FAILURES.inc()
         logger.error(f"Failed to get database connection from pool: {e}")
         raise
+    
+    with _pool_lock:
+        _pool_in_use += 1
+    return conn
 
 
-def return_db_connection(conn) -> None:
+def return_db_connection(conn, close: bool = False) -> None:
     """
     Return a connection to the pool.
     
     Args:
         conn: Database connection to return
+        close: Close the connection instead of keeping it for reuse
     """
-    global _db_pool
+    global _db_pool, _pool_in_use
     
     if _db_pool is None:
         return
     
     try:
-        _db_pool.putconn(conn)
+        _db_pool.putconn(conn, close=close)
     except Exception as e:
         logger.error(f"Failed to return connection to pool: {e}")
+    finally:
+        # The caller no longer holds the connection either way, so free its slot
+        with _pool_lock:
+            _pool_in_use -= 1
+        if _pool_limiter is not None:
+            _pool_limiter.release()
 
 
 def close_connection_pool() -> None:
     """
     Close all connections in the pool.
     """
-    global _db_pool
+    global _db_pool, _pool_in_use
     
     if _db_pool is None:
         return
@@ -100,29 +154,30 @@ def close_connection_pool() -> None:
         logger.error(f"Error closing connection pool: {e}")
     finally:
         _db_pool = None
+        _pool_in_use = 0
 
 
-def check_db_health() -> bool:
+def check_db_health() -> str:
     """
-    Check if database is accessible.
+    Check if database is accessible, without queueing behind request traffic.
     
     Returns:
-        True if database is accessible, False otherwise
+        'healthy', 'saturated' if every pooled connection is busy, or 'unhealthy'
     """
     conn = None
     try:
-        conn = get_db_connection()
+        conn = get_db_connection(wait=False)
         cursor = conn.cursor()
         cursor.execute("SELECT 1")
         cursor.fetchone()
         cursor.close()
-        return_db_connection(conn)
-        return True
+        return 'healthy'
+    except OverloadedError:
+        # Every connection is serving requests - PostgreSQL is up, just busy
+        return 'saturated'
     except Exception as e:
         logger.error(f"Database health check failed: {e}")
-        if conn:
-            try:
-                return_db_connection(conn)
-            except:
-                pass
-        return False
+        return 'unhealthy'
+    finally:
+        if conn is not None:
+            return_db_connection(conn)
@@ -0,0 +1,363 @@
+"""
+In-process Pokemon dataset snapshot with incremental, diff-applied reloads.
+
+The snapshot is the L1 copy of the dataset. Reloads detect changes to
+pokemon_db.json by mtime/size and content hash, diff records grouped by
+`number` (mega forms share a number), and reuse unchanged record objects so
+only the changed groups are rebuilt. Listeners are notified with the new
+snapshot and the diff so derived copies (Redis, indexes) can follow.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable, Dict, List, Optional
+
+import db
+import metrics
+
+logger = logging.getLogger(__name__)
+
+_snapshot: Optional['DatasetSnapshot'] = None
+_last_known_good: Optional['DatasetSnapshot'] = None
+_version: int = 0
+_reload_lock = threading.Lock()
+_listeners: List[Callable[['DatasetSnapshot', 'DatasetDiff'], None]] = []
+_watch_interval: float = float(os.getenv('DATASET_WATCH_INTERVAL', 2))
+_watcher_thread: Optional[threading.Thread] = None
+_stop_event = threading.Event()
+
+DATASET_RELOADS = metrics.counter(
+    'pokedex_dataset_reloads_total',
+    'Dataset reload checks by result',
+    ['result']
+)
+DATASET_RECORDS_CHANGED = metrics.counter(
+    'pokedex_dataset_record_changes_total',
+    'Pokemon numbers changed by incremental reloads',
+    ['change']
+)
+DATASET_RELOAD_SECONDS = metrics.histogram(
+    'pokedex_dataset_reload_duration_seconds',
+    'Duration of reloads that found a content change'
+)
+DATASET_STATE = metrics.gauge(
+    'pokedex_dataset_state',
+    'In-process dataset snapshot version and size',
+    ['field']
+)
+DATASET_STATE.set_function(lambda: _snapshot.version if _snapshot else 0, field='version')
+DATASET_STATE.set_function(lambda: len(_snapshot.records) if _snapshot else 0, field='records')
+
+
+@dataclass(frozen=True)
+class DatasetDiff:
+    """Pokemon numbers added, removed or updated between two snapshots."""
+
+    added: List[int] = field(default_factory=list)
+    removed: List[int] = field(default_factory=list)
+    updated: List[int] = field(default_factory=list)
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.added or self.removed or self.updated)
+
+    def summary(self) -> Dict[str, int]:
+        return {'added': len(self.added), 'removed': len(self.removed), 'updated': len(self.updated)}
+
+
+@dataclass(frozen=True)
+class DatasetSnapshot:
+    """Immutable view of one dataset version."""
+
+    version: int
+    records: List[Dict[str, Any]]
+    by_number: Dict[int, List[Dict[str, Any]]]
+    type_counts: Dict[str, int]
+    types: List[str]
+    mtime_ns: Optional[int] = None
+    size: Optional[int] = None
+    content_hash: Optional[str] = None
+    loaded_at: float = field(default_factory=time.time)
+
+
+def _group_by_number(records: List[Dict[str, Any]]) -> Dict[int, List[Dict[str, Any]]]:
+    groups: Dict[int, List[Dict[str, Any]]] = {}
+    for record in records:
+        groups.setdefault(record.get('number'), []).append(record)
+    return groups
+
+
+def _count_types(records: List[Dict[str, Any]], counts: Dict[str, int], delta: int) -> None:
+    for record in records:
+        for key in ('type_one', 'type_two'):
+            type_name = record.get(key)
+            if type_name:
+                counts[type_name] = counts.get(type_name, 0) + delta
+
+
+def _sorted_types(counts: Dict[str, int]) -> List[str]:
+    return sorted(type_name for type_name, count in counts.items() if count > 0)
+
+
+def _hash_content(content: bytes) -> str:
+    return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+
+def _file_stat() -> Optional[os.stat_result]:
+    try:
+        return os.stat(db.DB_PATH)
+    except OSError as e:
+        logger.error(f"Failed to stat dataset file: {e}")
+        return None
+
+
+def get_snapshot() -> Optional[DatasetSnapshot]:
+    """
+    Get the current in-process dataset snapshot.
+
+    Returns:
+        Current snapshot, or None if the dataset has not been loaded
+    """
+    return _snapshot
+
+
+def install_snapshot(records: List[Dict[str, Any]]) -> DatasetSnapshot:
+    """
+    Replace the in-process dataset with a full copy (cold load from Redis or db.get()).
+
+    The file fingerprint is left unset, so the next reload check hashes the
+    file and diffs it against these records.
+
+    Args:
+        records: Complete list of Pokemon dictionaries
+
+    Returns:
+        The installed snapshot
+    """
+    global _snapshot, _version
+
+    type_counts: Dict[str, int] = {}
+    _count_types(records, type_counts, 1)
+    with _reload_lock:
+        _version += 1
+        _snapshot = DatasetSnapshot(
+            version=_version,
+            records=records,
+            by_number=_group_by_number(records),
+            type_counts=type_counts,
+            types=_sorted_types(type_counts)
+        )
+        logger.info(f"Dataset snapshot v{_version} installed ({len(records)} records)")
+        return _snapshot
+
+
+def get_last_known_good() -> Optional[DatasetSnapshot]:
+    """
+    Get the current snapshot, or the one dropped by the last clear_snapshot().
+
+    Returns:
+        Most recent snapshot, or None if the dataset was never loaded
+    """
+    return _snapshot or _last_known_good
+
+
+def clear_snapshot() -> None:
+    """
+    Drop the in-process dataset so the next read performs a cold load.
+
+    The dropped snapshot is kept as the last known good copy for degraded reads.
+    """
+    global _snapshot, _last_known_good
+
+    with _reload_lock:
+        if _snapshot is not None:
+            _last_known_good = _snapshot
+        _snapshot = None
+
+
+def diff_groups(
+    old: Dict[int, List[Dict[str, Any]]],
+    new: Dict[int, List[Dict[str, Any]]]
+) -> DatasetDiff:
+    """
+    Diff two datasets grouped by Pokemon number.
+
+    Args:
+        old: Previous records grouped by number
+        new: Current records grouped by number
+
+    Returns:
+        Numbers added, removed and updated
+    """
+    added = [number for number in new if number not in old]
+    removed = [number for number in old if number not in new]
+    updated = [number for number in new if number in old and new[number] != old[number]]
+    return DatasetDiff(added=added, removed=removed, updated=updated)
+
+
+def _apply_diff(
+    current: DatasetSnapshot,
+    new_groups: Dict[int, List[Dict[str, Any]]],
+    diff: DatasetDiff,
+    stat: os.stat_result,
+    content_hash: str
+) -> DatasetSnapshot:
+    """Build the next snapshot, reusing record objects for unchanged numbers."""
+    updated = set(diff.updated)
+    by_number: Dict[int, List[Dict[str, Any]]] = {}
+    records: List[Dict[str, Any]] = []
+    for number, group in new_groups.items():
+        if number in current.by_number and number not in updated:
+            group = current.by_number[number]
+        by_number[number] = group
+        records.extend(group)
+
+    type_counts = dict(current.type_counts)
+    for number in diff.removed + diff.updated:
+        _count_types(current.by_number[number], type_counts, -1)
+    for number in diff.added + diff.updated:
+        _count_types(new_groups[number], type_counts, 1)
+
+    return DatasetSnapshot(
+        version=_version + 1,
+        records=records,
+        by_number=by_number,
+        type_counts=type_counts,
+        types=_sorted_types(type_counts),
+        mtime_ns=stat.st_mtime_ns,
+        size=stat.st_size,
+        content_hash=content_hash
+    )
+
+
+def reload_from_file(force: bool = False) -> Dict[str, Any]:
+    """
+    Apply changes in pokemon_db.json to the in-process dataset.
+
+    Skips work when mtime and size are unchanged (unless forced) and when the
+    content hash matches. Otherwise diffs records by number, applies only the
+    changed groups, bumps the version and notifies listeners.
+
+    Args:
+        force: Hash the file even if mtime and size are unchanged
+
+    Returns:
+        Dictionary with 'loaded', 'changed', 'version' and the diff summary
+    """
+    global _snapshot, _version
+
+    with _reload_lock:
+        current = _snapshot
+        if current is None:
+            DATASET_RELOADS.inc(result='not_loaded')
+            return {'loaded': False, 'changed': False, 'version': None}
+
+        stat = _file_stat()
+        if stat is None:
+            DATASET_RELOADS.inc(result='error')
+            return {'loaded': True, 'changed': False, 'version': current.version}
+
+        unchanged_stat = current.mtime_ns == stat.st_mtime_ns and current.size == stat.st_size
+        if unchanged_stat and not force:
+            DATASET_RELOADS.inc(result='unchanged')
+            return {'loaded': True, 'changed': False, 'version': current.version}
+
+        start = time.perf_counter()
+        try:
+            with open(db.DB_PATH, 'rb') as f:
+                content = f.read()
+            content_hash = _hash_content(content)
+            if content_hash == current.content_hash:
+                _snapshot = replace(current, mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+                DATASET_RELOADS.inc(result='unchanged')
+                return {'loaded': True, 'changed': False, 'version': current.version}
+
+            new_groups = _group_by_number(json.loads(content))
+        except Exception as e:
+            logger.error(f"Failed to read dataset file for reload: {e}")
+            DATASET_RELOADS.inc(result='error')
+            return {'loaded': True, 'changed': False, 'version': current.version}
+
+        diff = diff_groups(current.by_number, new_groups)
+        if diff.is_empty:
+            # Formatting-only change: remember the fingerprint, keep the version
+            _snapshot = replace(
+                current, mtime_ns=stat.st_mtime_ns, size=stat.st_size, content_hash=content_hash
+            )
+            DATASET_RELOADS.inc(result='unchanged')
+            return {'loaded': True, 'changed': False, 'version': current.version}
+
+        snapshot = _apply_diff(current, new_groups, diff, stat, content_hash)
+        _version = snapshot.version
+        _snapshot = snapshot
+
+        DATASET_RELOADS.inc(result='applied')
+        for change, numbers in (('added', diff.added), ('removed', diff.removed),
+                                ('updated', diff.updated)):
+            if numbers:
+                DATASET_RECORDS_CHANGED.inc(len(numbers), change=change)
+        DATASET_RELOAD_SECONDS.observe(time.perf_counter() - start)
+        logger.info(f"Dataset reloaded to v{snapshot.version}: {diff.summary()}")
+
+    for listener in list(_listeners):
+        try:
+            listener(snapshot, diff)
+        except Exception as e:
+            logger.error(f"Dataset change listener failed: {e}", exc_info=True)
+
+    return {'loaded': True, 'changed': True, 'version': snapshot.version, **diff.summary()}
+
+
+def add_change_listener(listener: Callable[[DatasetSnapshot, DatasetDiff], None]) -> None:
+    """
+    Register a callback invoked with (snapshot, diff) after an incremental reload.
+
+    Args:
+        listener: Callback to register
+    """
+    if listener not in _listeners:
+        _listeners.append(listener)
+
+
+def _watch_loop(interval: float) -> None:
+    while not _stop_event.wait(interval):
+        try:
+            reload_from_file()
+        except Exception as e:
+            logger.error(f"Dataset watcher failed: {e}", exc_info=True)
+
+
+def start_dataset_watcher(interval: Optional[float] = None) -> None:
+    """
+    Start the background thread that polls pokemon_db.json for changes.
+
+    Args:
+        interval: Seconds between checks (default DATASET_WATCH_INTERVAL)
+    """
+    global _watcher_thread, _watch_interval
+
+    if _watcher_thread is not None and _watcher_thread.is_alive():
+        return
+
+    if interval is not None:
+        _watch_interval = interval
+    _stop_event.clear()
+    _watcher_thread = threading.Thread(
+        target=_watch_loop, args=(_watch_interval,), name='dataset-watcher', daemon=True
+    )
+    _watcher_thread.start()
+    logger.info(f"Dataset watcher started (interval={_watch_interval}s)")
+
+
+def stop_dataset_watcher() -> None:
+    """Stop the background dataset watcher."""
+    global _watcher_thread
+
+    _stop_event.set()
+    if _watcher_thread is not None:
+        _watcher_thread.join(timeout=_watch_interval + 1)
+        _watcher_thread = None
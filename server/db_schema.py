@@ -1,14 +1,23 @@
 """
-Database schema initialization for captured_pokemon table.
-Run this on server startup to ensure the table exists.
+Database schema initialization for the trainer-scoped captured Pokemon tables.
+Run this on server startup to ensure the tables exist.
 """
 import os
+import json
 import logging
 import psycopg2
-from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT, ISOLATION_LEVEL_READ_COMMITTED
+
+import db
 
 logger = logging.getLogger(__name__)
 
+# Trainer that owns rows migrated from the legacy global captured_pokemon table
+DEFAULT_TRAINER_ID = 0
+
+# Number of hash partitions on trainer_id (0 keeps the table unpartitioned)
+CAPTURED_PARTITIONS = int(os.getenv('CAPTURED_PARTITIONS', 0))
+
 
 def get_db_connection():
     """Get PostgreSQL database connection."""
@@ -22,25 +31,48 @@ def get_db_connection():
 
 
 def init_database():
-    """Initialize the database schema for captured_pokemon table."""
+    """
+    Initialize the schema for trainer-scoped captured Pokemon.
+    
+    trainer_captured_pokemon is keyed by (trainer_id, pokemon_number,
+    pokemon_name): mega forms share a number, so the name completes the key.
+    The primary key INCLUDEs captured_at so keyset reads of a trainer's
+    collection are index-only scans. With CAPTURED_PARTITIONS > 0 the table
+    is hash partitioned on trainer_id. trainer_capture_counts keeps per-trainer
+    totals so counts never scan the collection.
+    """
     try:
         conn = get_db_connection()
         conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
         cursor = conn.cursor()
         
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS captured_pokemon (
-                pokemon_name VARCHAR(255) PRIMARY KEY,
-                captured_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            );
+        partition_clause = 'PARTITION BY HASH (trainer_id)' if CAPTURED_PARTITIONS > 0 else ''
+        cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS trainer_captured_pokemon (
+                trainer_id BIGINT NOT NULL,
+                pokemon_number INTEGER NOT NULL,
+                pokemon_name VARCHAR(255) NOT NULL,
+                captured_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (trainer_id, pokemon_number, pokemon_name) INCLUDE (captured_at)
+            ) {partition_clause};
         """)
         
+        for remainder in range(CAPTURED_PARTITIONS):
+            cursor.execute(f"""
+                CREATE TABLE IF NOT EXISTS trainer_captured_pokemon_p{remainder}
+                PARTITION OF trainer_captured_pokemon
+                FOR VALUES WITH (MODULUS {CAPTURED_PARTITIONS}, REMAINDER {remainder});
+            """)
+        
         cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_captured_pokemon_name 
-            ON captured_pokemon(pokemon_name);
+            CREATE TABLE IF NOT EXISTS trainer_capture_counts (
+                trainer_id BIGINT PRIMARY KEY,
+                captured_count INTEGER NOT NULL DEFAULT 0
+            );
         """)
         
         cursor.close()
+        migrate_legacy_captures(conn)
         conn.close()
         logger.info("Database schema initialized successfully")
         return True
@@ -49,6 +81,57 @@ def init_database():
         return False
 
 
+def migrate_legacy_captures(conn) -> None:
+    """
+    Move rows from the legacy global captured_pokemon table to DEFAULT_TRAINER_ID.
+    
+    The legacy table is renamed afterwards (not dropped), so the migration
+    runs once and un-captures by the default trainer are not re-applied.
+    
+    Args:
+        conn: Open database connection
+    """
+    cursor = conn.cursor()
+    cursor.execute("SELECT to_regclass('captured_pokemon')")
+    if cursor.fetchone()[0] is None:
+        cursor.close()
+        return
+    
+    # Legacy rows only hold names - resolve numbers from the dataset file
+    with open(db.DB_PATH, 'rb') as f:
+        numbers_by_name = {p['name']: p['number'] for p in json.loads(f.read())}
+    
+    conn.set_isolation_level(ISOLATION_LEVEL_READ_COMMITTED)
+    try:
+        cursor.execute("SELECT pokemon_name, captured_at FROM captured_pokemon")
+        rows = [
+            (DEFAULT_TRAINER_ID, numbers_by_name[name], name, captured_at)
+            for name, captured_at in cursor.fetchall()
+            if name in numbers_by_name
+        ]
+        cursor.executemany("""
+            INSERT INTO trainer_captured_pokemon
+                (trainer_id, pokemon_number, pokemon_name, captured_at)
+            VALUES (%s, %s, %s, COALESCE(%s, CURRENT_TIMESTAMP))
+            ON CONFLICT DO NOTHING
+        """, rows)
+        cursor.execute("""
+            INSERT INTO trainer_capture_counts (trainer_id, captured_count)
+            SELECT %s, COUNT(*) FROM trainer_captured_pokemon WHERE trainer_id = %s
+            ON CONFLICT (trainer_id) DO UPDATE SET captured_count = EXCLUDED.captured_count
+        """, (DEFAULT_TRAINER_ID, DEFAULT_TRAINER_ID))
+        cursor.execute("DROP INDEX IF EXISTS idx_captured_pokemon_name")
+        cursor.execute("ALTER TABLE captured_pokemon RENAME TO captured_pokemon_legacy")
+        conn.commit()
+        logger.info(f"Migrated {len(rows)} legacy captured Pokemon to trainer {DEFAULT_TRAINER_ID}")
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+        conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+
+
 if __name__ == '__main__':
     init_database()
 
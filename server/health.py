@@ -0,0 +1,193 @@
+"""
+Background health prober with cached results for liveness/readiness checks.
+"""
+import os
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import db
+import metrics
+from cache import (
+    check_redis_health,
+    init_redis_connection,
+    is_dataset_cache_warm,
+    is_redis_enabled,
+    warm_cache
+)
+from database import check_db_health
+
+logger = logging.getLogger(__name__)
+
+_probe_interval: float = float(os.getenv('HEALTH_PROBE_INTERVAL', 5))
+_health_state: Optional[Dict[str, Any]] = None
+_health_lock = threading.Lock()
+_prober_thread: Optional[threading.Thread] = None
+_stop_event = threading.Event()
+
+HEALTH_STATUS = metrics.gauge(
+    'pokedex_health_check_status',
+    'Result of the last background health check (1 healthy or saturated, 0 unhealthy)',
+    ['check']
+)
+HEALTH_PROBE_SECONDS = metrics.histogram(
+    'pokedex_health_probe_duration_seconds',
+    'Duration of a full background health probe'
+)
+
+
+def _status(healthy: bool) -> str:
+    return 'healthy' if healthy else 'unhealthy'
+
+
+def run_health_checks(warm: bool = False) -> Dict[str, Any]:
+    """
+    Run all health checks synchronously.
+
+    Args:
+        warm: Reconnect Redis and repopulate an expired dataset cache
+
+    Returns:
+        Dictionary with overall status and per-service results
+    """
+    start = time.perf_counter()
+    services: Dict[str, Any] = {}
+
+    # Check Redis, reconnecting if a previous error disabled caching
+    if warm and not is_redis_enabled():
+        init_redis_connection(max_retries=1)
+    redis_healthy = check_redis_health()
+    services['redis'] = {
+        'status': _status(redis_healthy),
+        'enabled': is_redis_enabled()
+    }
+
+    # Check PostgreSQL (a saturated pool means the database is up and busy)
+    services['postgresql'] = {'status': check_db_health()}
+
+    # Check DB file access (don't actually read it)
+    try:
+        file_accessible = os.path.exists(db.DB_PATH) and os.access(db.DB_PATH, os.R_OK)
+        services['db_file'] = {'status': _status(file_accessible)}
+    except Exception as e:
+        logger.error(f"DB file health check failed: {e}")
+        services['db_file'] = {'status': 'unhealthy', 'error': str(e)}
+
+    # Check the dataset cache, paying for db.get() here rather than in a request
+    if warm:
+        cache_warm = warm_cache()
+    else:
+        cache_warm = is_dataset_cache_warm()
+    services['dataset_cache'] = {'status': _status(cache_warm)}
+
+    all_healthy = (
+        services['postgresql']['status'] in ('healthy', 'saturated') and
+        services['db_file']['status'] == 'healthy'
+    )
+    duration = time.perf_counter() - start
+
+    for name, result in services.items():
+        HEALTH_STATUS.set(0 if result['status'] == 'unhealthy' else 1, check=name)
+    HEALTH_PROBE_SECONDS.observe(duration)
+
+    return {
+        'status': 'healthy' if all_healthy else 'degraded',
+        'services': services,
+        'checked_at': time.time(),
+        'duration_ms': round(duration * 1000, 2)
+    }
+
+
+def _probe_loop(interval: float) -> None:
+    global _health_state
+
+    while not _stop_event.is_set():
+        try:
+            state = run_health_checks(warm=True)
+            with _health_lock:
+                _health_state = state
+        except Exception as e:
+            logger.error(f"Health probe failed: {e}", exc_info=True)
+        _stop_event.wait(interval)
+
+
+def start_health_prober(interval: Optional[float] = None) -> None:
+    """
+    Start the background prober thread.
+
+    Args:
+        interval: Seconds between probes (default HEALTH_PROBE_INTERVAL)
+    """
+    global _prober_thread, _probe_interval
+
+    if _prober_thread is not None and _prober_thread.is_alive():
+        return
+
+    if interval is not None:
+        _probe_interval = interval
+    _stop_event.clear()
+    _prober_thread = threading.Thread(
+        target=_probe_loop, args=(_probe_interval,), name='health-prober', daemon=True
+    )
+    _prober_thread.start()
+    logger.info(f"Health prober started (interval={_probe_interval}s)")
+
+
+def stop_health_prober() -> None:
+    """Stop the background prober thread."""
+    global _prober_thread
+
+    _stop_event.set()
+    if _prober_thread is not None:
+        _prober_thread.join(timeout=_probe_interval + 1)
+        _prober_thread = None
+
+
+def is_prober_running() -> bool:
+    """
+    Check whether the background prober is running.
+
+    Returns:
+        True if the prober thread is alive, False otherwise
+    """
+    return _prober_thread is not None and _prober_thread.is_alive()
+
+
+def get_health_state() -> Optional[Dict[str, Any]]:
+    """
+    Get the most recent background probe result.
+
+    Returns:
+        Cached health state, or None if no probe has completed yet
+    """
+    with _health_lock:
+        return _health_state
+
+
+def get_readiness() -> Dict[str, Any]:
+    """
+    Evaluate readiness from the cached probe result.
+
+    A node is ready when PostgreSQL and the DB file are healthy, the dataset
+    is loaded in-process, and the last probe is recent (within three intervals).
+
+    Returns:
+        Dictionary with 'ready', a 'reason' when not ready, and the cached state
+    """
+    state = get_health_state()
+    if state is None:
+        return {'ready': False, 'reason': 'no health probe has completed yet', 'health': None}
+
+    age = time.time() - state['checked_at']
+    services = state['services']
+    if age > 3 * _probe_interval:
+        reason = f"health state is stale ({age:.1f}s old)"
+    elif state['status'] != 'healthy':
+        reason = 'required services are unhealthy'
+    elif services['dataset_cache']['status'] != 'healthy':
+        reason = 'dataset is not loaded'
+    else:
+        reason = None
+
+    return {'ready': reason is None, 'reason': reason, 'health': state}
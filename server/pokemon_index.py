@@ -0,0 +1,150 @@
+"""
+Hash index over the Pokemon dataset for O(1) lookups by number or name.
+
+One index is built per dataset snapshot version. Each record is serialized to
+JSON once at build time, and serialized records are reused from the previous
+index when an incremental reload kept the record object unchanged.
+"""
+import json
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import dataset
+import metrics
+
+logger = logging.getLogger(__name__)
+
+# (record, pre-serialized JSON)
+IndexEntry = Tuple[Dict[str, Any], str]
+
+_index: Optional['PokemonIndex'] = None
+_index_lock = threading.Lock()
+
+INDEX_BUILD_SECONDS = metrics.histogram(
+    'pokedex_index_build_duration_seconds',
+    'Time spent building the number/name hash index'
+)
+INDEX_BUILDS = metrics.counter(
+    'pokedex_index_builds_total',
+    'Number/name hash index builds'
+)
+
+
+def serialize_record(record: Dict[str, Any]) -> str:
+    """Serialize a record the same way jsonify does (compact, sorted keys)."""
+    return json.dumps(record, separators=(',', ':'), sort_keys=True)
+
+
+class PokemonIndex:
+    """Lookup tables for one dataset version, keyed on number and lowercased name."""
+
+    def __init__(self, snapshot: dataset.DatasetSnapshot, previous: Optional['PokemonIndex'] = None):
+        self.version = snapshot.version
+        reusable = previous._entries if previous is not None else {}
+
+        self._entries: Dict[int, IndexEntry] = {}
+        self._by_number: Dict[int, IndexEntry] = {}
+        self._by_name: Dict[str, IndexEntry] = {}
+
+        for record in snapshot.records:
+            entry = reusable.get(id(record))
+            if entry is None or entry[0] is not record:
+                entry = (record, serialize_record(record))
+            self._entries[id(record)] = entry
+
+            # Mega forms share a number - the number resolves to the first (base) form
+            self._by_number.setdefault(record.get('number'), entry)
+            name = record.get('name')
+            if name:
+                self._by_name[name.lower()] = entry
+
+    def _lookup(self, key: Union[int, str]) -> Optional[IndexEntry]:
+        if isinstance(key, bool):
+            return None
+        if isinstance(key, int):
+            return self._by_number.get(key)
+        if isinstance(key, str):
+            key = key.strip()
+            # isdecimal(), not isdigit(): '²' is a digit but int() rejects it
+            if key.isdecimal():
+                return self._by_number.get(int(key))
+            return self._by_name.get(key.lower())
+        return None
+
+    def find(self, key: Union[int, str]) -> Optional[Dict[str, Any]]:
+        """
+        Find a Pokemon by number or case-insensitive exact name.
+
+        Args:
+            key: Pokemon number (int or digit string) or name
+
+        Returns:
+            Pokemon dictionary, or None if not found
+        """
+        entry = self._lookup(key)
+        return entry[0] if entry else None
+
+    def find_json(self, key: Union[int, str]) -> Optional[str]:
+        """
+        Find a Pokemon's pre-serialized JSON by number or name.
+
+        Args:
+            key: Pokemon number (int or digit string) or name
+
+        Returns:
+            JSON string, or None if not found
+        """
+        entry = self._lookup(key)
+        return entry[1] if entry else None
+
+    def find_many_json(self, keys: List[Union[int, str]]) -> Tuple[List[str], List[Union[int, str]]]:
+        """
+        Resolve several keys, preserving request order.
+
+        Args:
+            keys: Pokemon numbers and/or names
+
+        Returns:
+            Tuple of (pre-serialized JSON of found Pokemon, keys that were not found)
+        """
+        found: List[str] = []
+        missing: List[Union[int, str]] = []
+        for key in keys:
+            entry = self._lookup(key)
+            if entry is None:
+                missing.append(key)
+            else:
+                found.append(entry[1])
+        return found, missing
+
+
+def get_index(snapshot: dataset.DatasetSnapshot) -> PokemonIndex:
+    """
+    Get the index for a dataset snapshot, building it once per version.
+
+    Args:
+        snapshot: Dataset snapshot the caller is serving from
+
+    Returns:
+        Index matching the snapshot version
+    """
+    global _index
+
+    index = _index
+    if index is not None and index.version == snapshot.version:
+        return index
+
+    with _index_lock:
+        index = _index
+        if index is not None and index.version == snapshot.version:
+            return index
+
+        start = time.perf_counter()
+        index = PokemonIndex(snapshot, previous=_index)
+        INDEX_BUILDS.inc()
+        INDEX_BUILD_SECONDS.observe(time.perf_counter() - start)
+        logger.info(f"Pokemon index built for dataset v{snapshot.version}")
+        _index = index
+        return index
@@ -0,0 +1,268 @@
+"""
+Opt-in request profiling that is safe to leave enabled in production.
+
+A request is profiled when it carries a valid ``X-Profile`` token header, or
+when it is picked by the ``PROFILE_SAMPLE_RATE`` random sample. Token-triggered
+requests get the profile back instead of the normal response; sampled requests
+are aggregated into an in-memory collapsed-stack table for flamegraphs.
+"""
+import cProfile
+import hmac
+import logging
+import marshal
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter as StackCounter
+from typing import Dict, Mapping, Optional, Set
+
+import metrics
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = 'X-Profile'
+PROFILE_MODE_HEADER = 'X-Profile-Mode'
+
+_profile_token: str = os.getenv('PROFILE_TOKEN', '')
+_sample_rate: float = float(os.getenv('PROFILE_SAMPLE_RATE', 0))
+_sample_interval: float = float(os.getenv('PROFILE_SAMPLE_INTERVAL_MS', 5)) / 1000
+_max_stack_depth: int = 128
+_max_aggregated_stacks: int = int(os.getenv('PROFILE_MAX_STACKS', 10000))
+
+# cProfile hooks are process-wide on newer Pythons, so only one runs at a time
+_cprofile_lock = threading.Lock()
+
+_aggregate_lock = threading.Lock()
+_aggregated_stacks: StackCounter = StackCounter()
+_aggregated_requests: int = 0
+
+PROFILED_REQUESTS = metrics.counter(
+    'pokedex_profiled_requests_total',
+    'Requests captured by the profiler by trigger and mode',
+    ['trigger', 'mode']
+)
+
+
+def _collapse_frame(frame) -> str:
+    """Render a frame chain as a root-first, semicolon separated stack."""
+    parts = []
+    while frame is not None and len(parts) < _max_stack_depth:
+        code = frame.f_code
+        parts.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    parts.reverse()
+    return ';'.join(parts)
+
+
+class _SharedSampler:
+    """
+    One helper thread that samples every profiled request thread.
+
+    A single sys._current_frames() snapshot per interval serves all profiled
+    requests, so sampling cost grows linearly with profiled requests rather
+    than with a thread (and a full frame snapshot) per request. The thread
+    exits when nothing is being profiled.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._active: Dict[int, 'StackSampler'] = {}
+        self._pending: Set[int] = set()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def add(self, sampler: 'StackSampler') -> None:
+        with self._lock:
+            self._active[sampler.thread_id] = sampler
+            self._pending.add(sampler.thread_id)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+                self._thread.start()
+        # Sample new requests immediately so ones shorter than an interval still show up
+        self._wake.set()
+
+    def remove(self, sampler: 'StackSampler') -> None:
+        with self._lock:
+            if self._active.get(sampler.thread_id) is sampler:
+                del self._active[sampler.thread_id]
+            self._pending.discard(sampler.thread_id)
+
+    def _run(self) -> None:
+        while True:
+            woken = self._wake.wait(self.interval)
+            self._wake.clear()
+            with self._lock:
+                if not self._active:
+                    self._thread = None
+                    return
+                # A wake-up only samples newly started requests to keep the rate even
+                thread_ids = list(self._pending) if woken else list(self._active)
+                self._pending.clear()
+
+            frames = sys._current_frames()
+            with self._lock:
+                for thread_id in thread_ids:
+                    sampler = self._active.get(thread_id)
+                    frame = frames.get(thread_id)
+                    if sampler is not None and frame is not None:
+                        sampler.samples[_collapse_frame(frame)] += 1
+            del frames
+
+
+_shared_sampler = _SharedSampler(_sample_interval)
+
+
+class StackSampler:
+    """Collects stack samples of a single request thread from the shared sampler thread."""
+
+    mode = 'sample'
+
+    def __init__(self, thread_id: int):
+        self.thread_id = thread_id
+        self.interval = _shared_sampler.interval
+        self.samples: StackCounter = StackCounter()
+
+    def start(self) -> None:
+        _shared_sampler.add(self)
+
+    def stop(self) -> None:
+        _shared_sampler.remove(self)
+
+    def sample_count(self) -> int:
+        return sum(self.samples.values())
+
+    def collapsed(self) -> str:
+        """Return samples in the collapsed-stack format used by flamegraph tools."""
+        if not self.samples:
+            return (
+                f"# no stack samples captured: the request finished before the sampler ran "
+                f"(interval {self.interval * 1000:g}ms); retry with {PROFILE_MODE_HEADER}: cprofile\n"
+            )
+        return ''.join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+
+class CProfiler:
+    """Deterministic cProfile capture of the current thread."""
+
+    mode = 'cprofile'
+
+    def __init__(self):
+        self.profile = cProfile.Profile()
+
+    def start(self) -> None:
+        self.profile.enable()
+
+    def stop(self) -> None:
+        # Releases the lock taken in start_request_profiler
+        self.profile.disable()
+        _cprofile_lock.release()
+
+    def dump(self) -> bytes:
+        """Return the profile in the binary pstats format (loadable with pstats/snakeviz)."""
+        self.profile.create_stats()
+        return marshal.dumps(self.profile.stats)
+
+
+def _is_authorized(token: Optional[str]) -> bool:
+    """Check a profile token against PROFILE_TOKEN in constant time."""
+    if not _profile_token or not token:
+        return False
+    return hmac.compare_digest(token.encode(), _profile_token.encode())
+
+
+def is_authorized(headers: Mapping[str, str]) -> bool:
+    """
+    Check whether request headers carry a valid profile token.
+
+    Args:
+        headers: Request headers
+
+    Returns:
+        True if the X-Profile header matches PROFILE_TOKEN
+    """
+    return _is_authorized(headers.get(PROFILE_HEADER))
+
+
+def start_request_profiler(headers: Mapping[str, str]):
+    """
+    Start a profiler for the current request if it is requested or sampled.
+
+    Args:
+        headers: Request headers
+
+    Returns:
+        Tuple of (profiler, trigger) or (None, None) if the request is not profiled
+    """
+    trigger = None
+    if PROFILE_HEADER in headers:
+        if is_authorized(headers):
+            trigger = 'header'
+        else:
+            logger.warning("Ignoring profile request with invalid token")
+    elif _sample_rate > 0 and random.random() < _sample_rate:
+        trigger = 'sampled'
+
+    if trigger is None:
+        return None, None
+
+    profiler = None
+    if trigger == 'header' and headers.get(PROFILE_MODE_HEADER, '').lower() == 'cprofile':
+        if _cprofile_lock.acquire(blocking=False):
+            profiler = CProfiler()
+        else:
+            logger.info("cProfile busy with another request - falling back to stack sampling")
+    if profiler is None:
+        profiler = StackSampler(threading.get_ident())
+
+    profiler.start()
+    PROFILED_REQUESTS.inc(trigger=trigger, mode=profiler.mode)
+    return profiler, trigger
+
+
+def record_sampled_profile(profiler: StackSampler) -> None:
+    """
+    Merge a sampled request's stacks into the aggregate collapsed-stack table.
+
+    Args:
+        profiler: Stopped stack sampler
+    """
+    global _aggregated_requests
+
+    with _aggregate_lock:
+        _aggregated_requests += 1
+        for stack, count in profiler.samples.items():
+            if stack in _aggregated_stacks or len(_aggregated_stacks) < _max_aggregated_stacks:
+                _aggregated_stacks[stack] += count
+
+
+def get_aggregated_profile(reset: bool = False) -> Dict[str, object]:
+    """
+    Get the aggregated collapsed stacks captured from sampled traffic.
+
+    Args:
+        reset: Clear the aggregate after reading it
+
+    Returns:
+        Dictionary with the number of sampled requests and collapsed stack text
+    """
+    global _aggregated_requests
+
+    with _aggregate_lock:
+        collapsed = ''.join(
+            f"{stack} {count}\n" for stack, count in _aggregated_stacks.most_common()
+        )
+        requests = _aggregated_requests
+        if reset:
+            _aggregated_stacks.clear()
+            _aggregated_requests = 0
+
+    return {'requests': requests, 'collapsed': collapsed}
+
+
+def profile_filename(profiler) -> str:
+    """Build a download filename for a captured profile."""
+    extension = 'prof' if profiler.mode == 'cprofile' else 'collapsed.txt'
+    return f"profile-{time.strftime('%Y%m%d-%H%M%S')}.{extension}"
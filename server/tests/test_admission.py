@@ -0,0 +1,113 @@
+"""
+Tests for the admission control limiters.
+"""
+import threading
+import time
+
+import pytest
+from werkzeug.test import Client
+
+import admission
+from admission import ConcurrencyLimiter, OverloadedError
+
+
+def _wait_until(predicate, timeout: float = 2.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError('condition not reached in time')
+        time.sleep(0.001)
+
+
+def test_acquire_within_limit_does_not_queue():
+    limiter = ConcurrencyLimiter('test_free', max_concurrent=2, max_queue=0, queue_timeout=0.1)
+
+    limiter.acquire()
+    limiter.acquire()
+
+    assert limiter.active == 2
+    assert limiter.waiting == 0
+
+
+def test_queue_full_rejects_immediately():
+    limiter = ConcurrencyLimiter('test_full', max_concurrent=1, max_queue=0, queue_timeout=5,
+                                 retry_after=3)
+    limiter.acquire()
+
+    start = time.perf_counter()
+    with pytest.raises(OverloadedError) as excinfo:
+        limiter.acquire()
+
+    assert time.perf_counter() - start < 1
+    assert excinfo.value.limiter == 'test_full'
+    assert excinfo.value.retry_after == 3
+    assert limiter.active == 1
+
+
+def test_queue_timeout_rejects_and_leaves_queue():
+    limiter = ConcurrencyLimiter('test_timeout', max_concurrent=1, max_queue=1, queue_timeout=0.05)
+    limiter.acquire()
+
+    with pytest.raises(OverloadedError):
+        limiter.acquire()
+
+    assert limiter.waiting == 0
+    assert limiter.active == 1
+
+
+def test_waiter_is_admitted_after_release():
+    limiter = ConcurrencyLimiter('test_release', max_concurrent=1, max_queue=1, queue_timeout=5)
+    limiter.acquire()
+    admitted = threading.Event()
+
+    def waiter():
+        limiter.acquire()
+        admitted.set()
+
+    thread = threading.Thread(target=waiter)
+    thread.start()
+    _wait_until(lambda: limiter.waiting == 1)
+    assert not admitted.is_set()
+
+    limiter.release()
+    thread.join(timeout=2)
+
+    assert admitted.is_set()
+    assert limiter.active == 1
+    assert limiter.waiting == 0
+
+
+def test_slot_releases_on_error():
+    limiter = ConcurrencyLimiter('test_slot', max_concurrent=1, max_queue=0, queue_timeout=0.1)
+
+    with pytest.raises(RuntimeError):
+        with limiter.slot():
+            raise RuntimeError('boom')
+
+    assert limiter.active == 0
+
+
+def test_try_acquire_never_queues():
+    limiter = ConcurrencyLimiter('test_try', max_concurrent=1, max_queue=4, queue_timeout=5)
+
+    assert limiter.try_acquire()
+    assert not limiter.try_acquire()
+    assert limiter.waiting == 0
+
+    limiter.release()
+    assert limiter.try_acquire()
+
+
+def test_full_route_queue_returns_503(monkeypatch):
+    from app import app
+
+    limiter = ConcurrencyLimiter('route:test', max_concurrent=0, max_queue=0, queue_timeout=0.1,
+                                 retry_after=7)
+    monkeypatch.setitem(admission._route_limiters, '/api/pokemon/types', limiter)
+    client = Client(app, app.response_class)
+
+    response = client.get('/api/pokemon/types')
+
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '7'
+    assert limiter.active == 0
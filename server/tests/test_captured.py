@@ -0,0 +1,69 @@
+"""
+Tests for captured Pokemon keyset cursors and pagination.
+"""
+import pytest
+
+import captured
+import database
+from benchmarks.fakes import FakeConnectionPool
+from captured import decode_cursor, encode_cursor
+
+
+@pytest.mark.parametrize('number, name', [
+    (1, 'Bulbasaur'),
+    (3, 'VenusaurMega Venusaur'),
+    (669, 'Flabébé'),
+    (122, 'Mr. Mime'),
+    (0, 'Name:With:Colons'),
+])
+def test_cursor_round_trip(number, name):
+    cursor = encode_cursor(number, name)
+
+    assert '=' not in cursor
+    assert decode_cursor(cursor) == (number, name)
+
+
+@pytest.mark.parametrize('cursor', ['', '!!!', 'bm9jb2xvbg', encode_cursor(1, 'x')[:-2] + '$$'])
+def test_decode_rejects_malformed_cursor(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    fake_pool = FakeConnectionPool()
+    monkeypatch.setattr(database, '_db_pool', fake_pool)
+    monkeypatch.setattr(database, '_pool_limiter', None)
+    monkeypatch.setattr(database, '_pool_in_use', 0)
+    return fake_pool
+
+
+def test_keyset_pages_cover_collection_once(pool):
+    pokemon = [(3, 'Venusaur'), (3, 'VenusaurMega Venusaur'), (1, 'Bulbasaur'),
+               (25, 'Pikachu'), (6, 'Charizard')]
+    for number, name in pokemon:
+        assert captured.set_captured(7, number, name, True)
+    captured.set_captured(8, 150, 'Mewtwo', True)
+
+    seen = []
+    after = None
+    while True:
+        page = captured.list_captured(7, after=after, limit=2)
+        assert page['total'] == len(pokemon)
+        seen.extend((item['number'], item['name']) for item in page['items'])
+        if page['next_cursor'] is None:
+            break
+        after = decode_cursor(page['next_cursor'])
+
+    assert seen == sorted(pokemon)
+    assert database._pool_in_use == 0
+
+
+def test_set_captured_reports_changes_and_keeps_count(pool):
+    assert captured.set_captured(1, 25, 'Pikachu', True)
+    assert not captured.set_captured(1, 25, 'Pikachu', True)
+    assert captured.list_captured(1)['total'] == 1
+
+    assert captured.set_captured(1, 25, 'Pikachu', False)
+    assert not captured.set_captured(1, 25, 'Pikachu', False)
+    assert captured.list_captured(1) == {'items': [], 'total': 0, 'next_cursor': None}
@@ -0,0 +1,136 @@
+"""
+Tests for incremental dataset reloads.
+"""
+import json
+import os
+
+import pytest
+
+import dataset
+import db
+
+
+def _record(number, name, type_one, type_two=''):
+    return {'number': number, 'name': name, 'type_one': type_one, 'type_two': type_two}
+
+
+def _expected_type_counts(records):
+    counts = {}
+    for record in records:
+        for key in ('type_one', 'type_two'):
+            if record[key]:
+                counts[record[key]] = counts.get(record[key], 0) + 1
+    return counts
+
+
+BASE_RECORDS = [
+    _record(1, 'Bulbasaur', 'Grass', 'Poison'),
+    _record(3, 'Venusaur', 'Grass', 'Poison'),
+    _record(3, 'VenusaurMega Venusaur', 'Grass', 'Poison'),
+    _record(4, 'Charmander', 'Fire'),
+    _record(7, 'Squirtle', 'Water'),
+]
+
+
+@pytest.fixture
+def dataset_file(tmp_path, monkeypatch):
+    path = tmp_path / 'pokemon_db.json'
+    monkeypatch.setattr(db, 'DB_PATH', str(path))
+    monkeypatch.setattr(dataset, '_listeners', [])
+    monkeypatch.setattr(dataset, '_snapshot', None)
+    monkeypatch.setattr(dataset, '_last_known_good', None)
+    return path
+
+
+def _write(path, records):
+    path.write_text(json.dumps(records))
+    # Make sure the mtime/size fingerprint changes even within one clock tick
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+def test_diff_groups_reports_added_removed_and_updated():
+    old = dataset._group_by_number(BASE_RECORDS)
+    new_records = [r for r in BASE_RECORDS if r['number'] != 7] + [_record(25, 'Pikachu', 'Electric')]
+    new_records[3] = _record(4, 'Charmander', 'Fire', 'Dragon')
+
+    diff = dataset.diff_groups(old, dataset._group_by_number(new_records))
+
+    assert diff.added == [25]
+    assert diff.removed == [7]
+    assert diff.updated == [4]
+
+
+def test_reload_keeps_type_counts_consistent(dataset_file):
+    dataset.install_snapshot(json.loads(json.dumps(BASE_RECORDS)))
+    new_records = [
+        _record(1, 'Bulbasaur', 'Grass', 'Poison'),
+        _record(3, 'Venusaur', 'Grass', 'Poison'),
+        _record(3, 'VenusaurMega Venusaur', 'Grass', 'Fairy'),  # updated (mega form)
+        _record(4, 'Charmander', 'Fire'),
+        _record(25, 'Pikachu', 'Electric'),                     # added; 7 removed
+    ]
+    _write(dataset_file, new_records)
+
+    result = dataset.reload_from_file()
+    snapshot = dataset.get_snapshot()
+
+    assert result['changed'] is True
+    assert (result['added'], result['removed'], result['updated']) == (1, 1, 1)
+    assert snapshot.records == new_records
+    assert snapshot.type_counts.get('Water', 0) == 0
+    assert {t: c for t, c in snapshot.type_counts.items() if c} == _expected_type_counts(new_records)
+    assert snapshot.types == sorted(_expected_type_counts(new_records))
+
+
+def test_reload_reuses_unchanged_records(dataset_file):
+    before = dataset.install_snapshot(json.loads(json.dumps(BASE_RECORDS)))
+    new_records = json.loads(json.dumps(BASE_RECORDS))
+    new_records[4] = _record(7, 'Squirtle', 'Water', 'Ice')
+    _write(dataset_file, new_records)
+
+    dataset.reload_from_file()
+    after = dataset.get_snapshot()
+
+    assert after.version == before.version + 1
+    assert after.by_number[1][0] is before.by_number[1][0]
+    assert after.by_number[3] is before.by_number[3]
+    assert after.by_number[7][0] is not before.by_number[7][0]
+    assert after.type_counts == _expected_type_counts(new_records)
+
+
+def test_repeated_reloads_track_a_full_rebuild(dataset_file):
+    dataset.install_snapshot(json.loads(json.dumps(BASE_RECORDS)))
+    steps = [
+        BASE_RECORDS + [_record(25, 'Pikachu', 'Electric')],
+        [r for r in BASE_RECORDS if r['number'] != 1] + [_record(25, 'Pikachu', 'Electric')],
+        [_record(25, 'Raichu', 'Electric', 'Psychic')],
+        BASE_RECORDS,
+    ]
+
+    for records in steps:
+        _write(dataset_file, records)
+        dataset.reload_from_file()
+        snapshot = dataset.get_snapshot()
+        live_counts = {t: c for t, c in snapshot.type_counts.items() if c}
+
+        assert live_counts == _expected_type_counts(records)
+        assert all(count >= 0 for count in snapshot.type_counts.values())
+        assert snapshot.types == sorted(live_counts)
+
+
+def test_unchanged_content_keeps_version(dataset_file):
+    _write(dataset_file, BASE_RECORDS)
+    dataset.install_snapshot(json.loads(json.dumps(BASE_RECORDS)))
+    version = dataset.get_snapshot().version
+
+    result = dataset.reload_from_file(force=True)
+
+    assert result['changed'] is False
+    assert dataset.get_snapshot().version == version
+
+
+def test_reload_before_load_is_a_no_op(dataset_file):
+    _write(dataset_file, BASE_RECORDS)
+
+    assert dataset.reload_from_file() == {'loaded': False, 'changed': False, 'version': None}
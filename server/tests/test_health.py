@@ -0,0 +1,109 @@
+"""
+Tests for readiness evaluated from the cached health probe state.
+"""
+import time
+
+import pytest
+from werkzeug.test import Client
+
+import health
+
+PROBE_INTERVAL = 5
+
+
+def _state(postgresql='healthy', db_file='healthy', dataset_cache='healthy', age=0.0):
+    services = {
+        'redis': {'status': 'unhealthy', 'enabled': False},
+        'postgresql': {'status': postgresql},
+        'db_file': {'status': db_file},
+        'dataset_cache': {'status': dataset_cache},
+    }
+    up = postgresql in ('healthy', 'saturated') and db_file == 'healthy'
+    return {
+        'status': 'healthy' if up else 'degraded',
+        'services': services,
+        'checked_at': time.time() - age,
+        'duration_ms': 1.0,
+    }
+
+
+@pytest.fixture(autouse=True)
+def probe_interval(monkeypatch):
+    monkeypatch.setattr(health, '_probe_interval', PROBE_INTERVAL)
+    monkeypatch.setattr(health, '_health_state', None)
+
+
+def test_not_ready_before_first_probe():
+    readiness = health.get_readiness()
+
+    assert readiness['ready'] is False
+    assert readiness['health'] is None
+
+
+def test_ready_endpoint_returns_503_before_first_probe():
+    from app import app
+
+    response = Client(app, app.response_class).get('/api/health/ready')
+
+    assert response.status_code == 503
+    assert response.get_json()['status'] == 'not_ready'
+    assert 'reason' in response.get_json()
+
+
+def test_ready_with_fresh_healthy_state(monkeypatch):
+    monkeypatch.setattr(health, '_health_state', _state())
+
+    readiness = health.get_readiness()
+
+    assert readiness['ready'] is True
+    assert readiness['reason'] is None
+
+
+def test_stale_state_is_not_ready(monkeypatch):
+    monkeypatch.setattr(health, '_health_state', _state(age=3 * PROBE_INTERVAL + 1))
+
+    readiness = health.get_readiness()
+
+    assert readiness['ready'] is False
+    assert 'stale' in readiness['reason']
+
+
+def test_state_within_three_intervals_is_ready(monkeypatch):
+    monkeypatch.setattr(health, '_health_state', _state(age=3 * PROBE_INTERVAL - 1))
+
+    assert health.get_readiness()['ready'] is True
+
+
+def test_saturated_postgresql_counts_as_up(monkeypatch):
+    monkeypatch.setattr(health, '_health_state', _state(postgresql='saturated'))
+
+    assert health.get_readiness()['ready'] is True
+
+
+def test_unhealthy_postgresql_is_not_ready(monkeypatch):
+    monkeypatch.setattr(health, '_health_state', _state(postgresql='unhealthy'))
+
+    readiness = health.get_readiness()
+
+    assert readiness['ready'] is False
+    assert readiness['reason'] == 'required services are unhealthy'
+
+
+def test_unloaded_dataset_is_not_ready(monkeypatch):
+    monkeypatch.setattr(health, '_health_state', _state(dataset_cache='unhealthy'))
+
+    readiness = health.get_readiness()
+
+    assert readiness['ready'] is False
+    assert readiness['reason'] == 'dataset is not loaded'
+
+
+def test_run_health_checks_reports_saturated_pool_as_healthy(monkeypatch):
+    monkeypatch.setattr(health, 'check_redis_health', lambda: False)
+    monkeypatch.setattr(health, 'check_db_health', lambda: 'saturated')
+    monkeypatch.setattr(health, 'is_dataset_cache_warm', lambda: True)
+
+    state = health.run_health_checks()
+
+    assert state['services']['postgresql']['status'] == 'saturated'
+    assert state['status'] == 'healthy'
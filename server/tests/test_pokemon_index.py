@@ -0,0 +1,117 @@
+"""
+Tests for the number/name hash index and the detail and multi-get endpoints.
+"""
+import json
+
+import pytest
+from werkzeug.test import Client
+
+import cache
+import dataset
+import db
+import pokemon_index
+from benchmarks.fakes import FakeRedis
+from pokemon_index import PokemonIndex
+
+
+@pytest.fixture
+def client(monkeypatch):
+    # The artificial db.get() delay is irrelevant to lookups; skip it in tests only
+    monkeypatch.setattr(db, 'QUERY_EXECUTION_TIME', 0)
+    monkeypatch.setattr(cache, '_redis_client', FakeRedis())
+    monkeypatch.setattr(cache, '_redis_enabled', True)
+    monkeypatch.setattr(dataset, '_snapshot', None)
+    monkeypatch.setattr(dataset, '_last_known_good', None)
+    monkeypatch.setattr(pokemon_index, '_index', None)
+
+    from app import app
+    return Client(app, app.response_class)
+
+
+def test_number_resolves_to_base_form(client):
+    response = client.get('/api/pokemon/3')
+
+    assert response.status_code == 200
+    assert response.get_json()['name'] == 'Venusaur'
+
+
+def test_mega_form_is_found_by_name(client):
+    response = client.get('/api/pokemon/CharizardMega%20Charizard%20Y')
+
+    assert response.status_code == 200
+    assert response.get_json()['number'] == 6
+
+
+def test_name_lookup_is_case_insensitive(client):
+    for key in ('pikachu', 'PIKACHU', 'PiKaChU'):
+        response = client.get(f'/api/pokemon/{key}')
+
+        assert response.status_code == 200
+        assert response.get_json()['name'] == 'Pikachu'
+
+
+@pytest.mark.parametrize('key', ['%C2%B2', 'missingno', '99999'])
+def test_unknown_key_returns_404(client, key):
+    response = client.get(f'/api/pokemon/{key}')
+
+    assert response.status_code == 404
+    assert 'error' in response.get_json()
+
+
+def test_multi_get_preserves_order_and_lists_missing(client):
+    keys = ['charmander', 25, 'nope', '3', '²', True, 'VenusaurMega Venusaur']
+
+    response = client.post('/api/pokemon/multi-get', json={'keys': keys})
+    body = response.get_json()
+
+    assert response.status_code == 200
+    assert [p['name'] for p in body['pokemon']] == [
+        'Charmander', 'Pikachu', 'Venusaur', 'VenusaurMega Venusaur'
+    ]
+    assert body['missing'] == ['nope', '²', True]
+
+
+@pytest.mark.parametrize('body', [[1, 2], {'keys': 'pikachu'}, {}, 'null'])
+def test_multi_get_rejects_invalid_json_bodies(client, body):
+    response = client.post('/api/pokemon/multi-get', json=body)
+
+    assert response.status_code == 400
+
+
+def test_multi_get_rejects_malformed_json(client):
+    response = client.post('/api/pokemon/multi-get', data='{"keys": [',
+                           content_type='application/json')
+
+    assert response.status_code == 400
+
+
+def test_multi_get_rejects_too_many_keys(client):
+    response = client.post('/api/pokemon/multi-get', json={'keys': list(range(1001))})
+
+    assert response.status_code == 400
+
+
+def test_detail_matches_jsonify_output(client):
+    from app import app
+
+    response = client.get('/api/pokemon/pikachu')
+    record = next(p for p in cache.get_cached_pokemon() if p['name'] == 'Pikachu')
+    with app.app_context():
+        from flask import jsonify
+        expected = jsonify(record).get_data(as_text=True).strip()
+
+    assert response.get_data(as_text=True) == expected
+
+
+def test_index_reuses_serialized_unchanged_records():
+    records = [
+        {'number': 1, 'name': 'Bulbasaur', 'type_one': 'Grass', 'type_two': 'Poison'},
+        {'number': 4, 'name': 'Charmander', 'type_one': 'Fire', 'type_two': ''},
+    ]
+    before = PokemonIndex(dataset.DatasetSnapshot(1, records, {}, {}, []))
+    changed = dict(records[1], type_two='Dragon')
+    after = PokemonIndex(dataset.DatasetSnapshot(2, [records[0], changed], {}, {}, []), before)
+
+    assert after.find_json(1) is before.find_json(1)
+    assert json.loads(after.find_json('charmander'))['type_two'] == 'Dragon'
+    assert after.find(True) is None